@@ -0,0 +1,181 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+Micro-benchmarks for Merchant's route finding, run over synthetic
+universes of increasing size so that no game files are needed.
+
+Usage:
+    python benchmarks/merchant.py --output baseline.json
+    python benchmarks/merchant.py --compare baseline.json
+
+Table population is only benchmarked if PyQt5 is installed.
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+from wingman.trade import MarketIndex, DockingMatrix, findRoutes  # noqa: E402
+
+# (systems, bases per system, goods, factions)
+SIZES = {
+    'small': (40, 4, 40, 20),
+    'medium': (120, 8, 120, 60),
+    'large': (300, 12, 250, 150),
+}
+TOP = 100  # the number of routes selected and displayed, as in Merchant's first page
+REGRESSION_THRESHOLD = 1.25  # a time this many times the baseline's is reported as a regression...
+REGRESSION_MINIMUM = 0.5e-3  # ...if it is also at least this many seconds slower, as shorter timings are mostly noise
+
+
+class Entity:
+    """A stand-in for a flint entity, identified by its nickname."""
+    def __init__(self, nickname: str, system: Optional['Entity'] = None):
+        self.nickname = nickname
+        self._system = system
+
+    def system(self) -> 'Entity':
+        return self._system
+
+
+def syntheticUniverse(systems: int, basesPerSystem: int, goods: int, factions: int, seed: int = 0):
+    """Generate a market index and docking matrix for a random universe. Each base trades a random fifth of goods,
+    selling some and buying others at prices scattered around each good's base price, and is closed to a random
+    tenth of factions."""
+    rng = np.random.default_rng(seed)
+    systemEntities = [Entity(f'sys{s:03}') for s in range(systems)]
+    bases = [Entity(f'sys{s:03}_base{b:02}', system) for s, system in enumerate(systemEntities)
+             for b in range(basesPerSystem)]
+    shape = (goods, len(bases))
+
+    trades = rng.random(shape) < 0.2
+    sold = trades & (rng.random(shape) < 0.5)
+    bought = trades & ~sold
+    basePrices = rng.integers(50, 5000, goods)[:, np.newaxis]
+    sells = (basePrices * rng.uniform(0.5, 1.5, shape)).astype(np.int64) * sold
+    buys = (basePrices * rng.uniform(0.5, 1.5, shape)).astype(np.int64) * bought
+    volumes = rng.integers(1, 4, goods)
+
+    index = MarketIndex([Entity(f'good{g:03}') for g in range(goods)], bases, sells, sold, buys, bought, volumes)
+    factionEntities = [Entity(f'faction{f:03}') for f in range(factions)]
+    docking = DockingMatrix(factionEntities, rng.random((factions, len(bases))) > 0.1)
+    return index, docking, systemEntities, factionEntities
+
+
+def best(function: Callable[[], object], repeat: int) -> float:
+    """The best time, in seconds, of `repeat` calls of `function`."""
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+
+def benchmarkSize(systems: int, basesPerSystem: int, goods: int, factions: int, repeat: int) -> Dict[str, float]:
+    """Run every benchmark over a universe of the given size."""
+    index, docking, systemEntities, factionEntities = syntheticUniverse(systems, basesPerSystem, goods, factions)
+    origin, destination, iff = systemEntities[0], systemEntities[-1], factionEntities[0]
+
+    routes = findRoutes(index, docking, origin)
+    rates = routes.profit / np.random.default_rng(1).uniform(1, 30, len(routes))
+    results = {
+        'routes': len(routes),
+        'routes_to_any': best(lambda: findRoutes(index, docking, origin), repeat),
+        'routes_to_system': best(lambda: findRoutes(index, docking, origin, destination), repeat),
+        'routes_to_any_with_iff': best(lambda: findRoutes(index, docking, origin, iff=iff), repeat),
+        'top_by_profit': best(lambda: routes.ranked(0, TOP), repeat),
+        'top_by_rate': best(lambda: routes.ranked(0, TOP, by=rates), repeat),
+        'full_sort': best(lambda: np.argsort(-routes.profit, kind='stable'), repeat),
+    }
+
+    try:
+        from PyQt5 import QtCore, QtWidgets
+    except ImportError:
+        return results
+
+    QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from wingman.models.routes import RouteTableModel
+    model = RouteTableModel()
+
+    def populate():
+        """Fill the model with the top routes, sort them as Merchant does and format the numeric cells."""
+        model.setRoutes(routes, rates, routes.ranked(0, TOP), market=index)
+        model.sort(1, QtCore.Qt.DescendingOrder)
+        for row in range(model.rowCount()):
+            for column in (1, 2):
+                model.data(model.index(row, column))
+
+    results['table_population'] = best(populate, repeat)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]]) -> List[str]:
+    """Print how each timing compares to the baseline. Return the names of those which have regressed."""
+    regressions = []
+    for size, timings in results.items():
+        for name, seconds in timings.items():
+            previous = baseline.get(size, {}).get(name)
+            if name == 'routes' or not previous:
+                continue
+            ratio = seconds / previous
+            regressed = ratio > REGRESSION_THRESHOLD and seconds - previous >= REGRESSION_MINIMUM
+            flag = '  REGRESSION' if regressed else ''
+            print(f'{size:>8} {name:<24} {seconds * 1e3:10.3f} ms {ratio:6.2f}× baseline{flag}')
+            if flag:
+                regressions.append(f'{size}/{name}')
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmarks and write or compare results."""
+    parser = argparse.ArgumentParser(description="Benchmark Merchant's route finding over synthetic universes.")
+    parser.add_argument('--sizes', nargs='+', choices=SIZES, default=list(SIZES), help='universe sizes to run')
+    parser.add_argument('--repeat', type=int, default=20, help='runs of each benchmark; the best is kept')
+    parser.add_argument('--output', help='write results to this file as JSON, for use as a baseline')
+    parser.add_argument('--compare', help='compare results to a baseline written with --output')
+    arguments = parser.parse_args()
+
+    results = {}
+    for size in arguments.sizes:
+        results[size] = benchmarkSize(*SIZES[size], repeat=arguments.repeat)
+        print(f'{size}: {results[size]["routes"]:,} routes', file=sys.stderr)
+
+    document = {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': results,
+    }
+    if arguments.output:
+        with open(arguments.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    if arguments.compare:
+        with open(arguments.compare) as f:
+            regressions = compare(results, json.load(f)['results'])
+        if regressions:
+            print(f'Regressed: {", ".join(regressions)}', file=sys.stderr)
+            return 1
+    elif not arguments.output:
+        print(json.dumps(document, indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
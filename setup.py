@@ -42,6 +42,7 @@ setup(
         'fl-flair>=0.5.0; platform_system=="Windows"',
         'ago==0.0.93',
         'Pillow>=8.1',
+        'numpy>=1.17',
         'PyQt5>=5.15.0',
         'PyQtWebEngine>=5.15.0',
     ],
@@ -49,6 +50,9 @@ setup(
     entry_points={
           'gui_scripts': [
               'wingman = wingman.main:main'
+          ],
+          'console_scripts': [
+              'wingman-trade = wingman.trade.cli:main'
           ]
     },
     data_files=[
@@ -26,12 +26,9 @@ import os
 import logging
 import signal
 import sys
+import time
 
-from PyQt5 import QtCore, QtGui, QtWidgets, QtWebEngineWidgets  # WebEngine must be imported here before QApp init
-
-# noinspection PyUnresolvedReferences
-from . import resources  # register resources
-from . import namespaces
+STARTED = time.perf_counter()  # for measuring startup time
 
 try:
     # noinspection PyUnresolvedReferences
@@ -45,27 +42,66 @@ NAVMAP_DIR = 'navmap'
 CONFIG_FILE = 'wingman.cfg'
 ROSTER_FILE = 'roster.json'
 LOG_FILE = 'wingman.log'
-
-# initialise QApplication
-app = QtWidgets.QApplication([__app__.lower()])
-app.setApplicationDisplayName(__app__)
-app.setApplicationName(__app__.lower())
-app.setWindowIcon(QtGui.QIcon(':/general/main'))
-
-# switch current working directory to a suitable location to store app data
-dataLocation = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.AppLocalDataLocation)
-os.makedirs(dataLocation, exist_ok=True)
-os.chdir(dataLocation)
-
-# configure logging
-# noinspection PyArgumentList
-logging.basicConfig(level=logging.INFO,
-                    format='[%(asctime)s] [%(levelname)s] %(message)s',
-                    handlers=[  # log to file and stdout
-                            logging.FileHandler(LOG_FILE),
-                            logging.StreamHandler()
-                        ]
-                    )
+CACHE_DIR = 'cache'
+OVERRIDES_FILE = 'price_overrides.json'
+TRACE_FILE = 'startup_trace.json'
+TRACE_SUMMARY_FILE = 'startup_trace.txt'
+
+
+def initialise():
+    """Initialise the application: create the QApplication, switch to the app data directory, configure logging
+    and initialise namespaces."""
+    global app, dataLocation, icons, config, QtWidgets
+    from .tracing import tracer
+
+    with tracer.span('import PyQt5'):
+        from PyQt5 import QtCore, QtGui, QtWidgets
+        # noinspection PyUnresolvedReferences
+        from . import resources  # register resources
+        from . import namespaces
+
+    # initialise QApplication
+    with tracer.span('QApplication'):
+        # QtWebEngineWidgets is only imported when the first map is created (see NavmapTab.createMapView). Importing
+        # it after QApplication is created requires OpenGL contexts to be shared
+        QtCore.QCoreApplication.setAttribute(QtCore.Qt.AA_ShareOpenGLContexts)
+        app = QtWidgets.QApplication([__app__.lower()])
+        app.setApplicationDisplayName(__app__)
+        app.setApplicationName(__app__.lower())
+        app.setWindowIcon(QtGui.QIcon(':/general/main'))
+
+    # switch current working directory to a suitable location to store app data
+    dataLocation = QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.AppLocalDataLocation)
+    os.makedirs(dataLocation, exist_ok=True)
+    os.chdir(dataLocation)
+
+    # configure logging
+    # noinspection PyArgumentList
+    logging.basicConfig(level=logging.INFO,
+                        format='[%(asctime)s] [%(levelname)s] %(message)s',
+                        handlers=[  # log to file and stdout
+                                logging.FileHandler(LOG_FILE),
+                                logging.StreamHandler()
+                            ]
+                        )
+
+    sys.excepthook = exception_hook
+    signal.signal(signal.SIGINT, signal.SIG_DFL)  # force Python to handle SIGINT even during app.exec
+
+    logging.info('Application start')
+    logging.info(f'Working directory: {os.getcwd()}')
+
+    # initialise namespaces
+    with tracer.span('Icons'):
+        icons = namespaces.Icons()
+    with tracer.span('Configuration'):
+        config = namespaces.Configuration(CONFIG_FILE)
+
+    # platform specific initialisation
+    if not IS_WIN:
+        if QtWidgets.QStyleFactory.keys() == ['Windows', 'Fusion']:
+            logging.warning("Native Qt style not available. Defaulting to Fusion - the application may not render "
+                            "correctly. To fix this, install the PyQt5 packages from your distro's repos, not pip.")
 
 
 def exception_hook(ex_type, value, traceback):
@@ -79,22 +115,13 @@ def exception_hook(ex_type, value, traceback):
         QtWidgets.QErrorMessage(app.activeWindow()).showMessage(repr(value), repr(value))
 
 
-sys.excepthook = exception_hook
-signal.signal(signal.SIGINT, signal.SIG_DFL)  # force Python to handle SIGINT even during app.exec
-
-
-logging.info('Application start')
-logging.info(f'Working directory: {os.getcwd()}')
-
-# initialise namespaces
-icons = namespaces.Icons()
-config = namespaces.Configuration(CONFIG_FILE)
-
-# platform specific initialisation
-if not IS_WIN:
-    if QtWidgets.QStyleFactory.keys() == ['Windows', 'Fusion']:
-        logging.warning("Native Qt style not available. Defaulting to Fusion - the application may not render "
-                        "correctly. To fix this, install the PyQt5 packages from your distro's repos, not pip.")
+def __getattr__(name):
+    """Initialise the application when one of the names it defines is first imported. Until then, nothing here
+    touches Qt, so Qt-free subpackages (see `trade`) can be used by worker processes and from the command line."""
+    if name in {'app', 'dataLocation', 'icons', 'config'}:
+        initialise()
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 RESTART_EXIT_CODE = 55
@@ -0,0 +1,167 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tracks which kinds of game data have changed on disk since
+they were loaded, and discards only the data parsed from those files.
+"""
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
+
+from flint.formats import dll, ini
+import flint as fl
+
+from . import snapshot
+from .models.labels import getBaseLabels, getBaseSolars
+from .trade.persistence import fingerprint
+from .trade.queries import routeCache
+from .trade import getMarketIndex, getDockingMatrix, getJumpTable, getTravelTimes, getLoopFinder, getHeatmap
+
+# the flint routines holding each kind of data
+ROUTINES = {
+    'universe': ('get_systems', 'get_bases', 'get_system_contents'),
+    'factions': ('get_factions',),
+    'equipment': ('get_equipment', 'get_commodities'),
+    'goods': ('get_goods',),
+    'ships': ('get_ships',),
+    'markets': ('get_markets',),
+    'resources': (),
+}
+
+# Wingman's own caches, and the kinds of data each is derived from
+DERIVED = {
+    getJumpTable: {'universe'},
+    getTravelTimes: {'universe', 'equipment', 'goods', 'markets'},
+    getMarketIndex: {'universe', 'equipment', 'goods', 'markets'},
+    getDockingMatrix: {'universe', 'factions', 'equipment', 'goods', 'markets'},
+    getLoopFinder: {'universe', 'equipment', 'goods', 'markets'},
+    getHeatmap: {'universe', 'equipment', 'goods', 'markets'},
+    routeCache: {'universe', 'factions', 'equipment', 'goods', 'markets'},
+    getBaseLabels: {'universe', 'factions', 'resources'},
+    getBaseSolars: {'universe'},
+}
+
+
+def walk(directory: str) -> Iterator[str]:
+    """Every file under `directory`."""
+    for root, _, files in os.walk(directory):
+        for file in files:
+            yield os.path.join(root, file)
+
+
+def kindFiles() -> Dict[str, Iterable[str]]:
+    """The files each kind of data is parsed from."""
+    universe = os.path.dirname(fl.paths.inis['universe'][0])
+    return {
+        'universe': walk(universe),
+        'factions': fl.paths.inis['initial_world'],
+        'equipment': fl.paths.inis['equipment'],
+        'goods': fl.paths.inis['goods'],
+        'ships': fl.paths.inis['ships'],
+        'markets': fl.paths.inis['markets'],
+        'resources': fl.paths.dlls.values(),
+    }
+
+
+class GameFiles:
+    """The state of the game files when they were last loaded."""
+
+    def __init__(self):
+        self.fingerprints: Dict[str, str] = {}
+
+    def record(self):
+        """Record the current state of the game files."""
+        self.fingerprints = {kind: fingerprint(files) for kind, files in kindFiles().items()}
+
+    def changed(self) -> Set[str]:
+        """The kinds of data whose files have changed since `record` was last called."""
+        return {kind for kind, files in kindFiles().items() if fingerprint(files) != self.fingerprints.get(kind)}
+
+    def discard(self, kinds: Set[str]):
+        """Discard the data parsed from files of the given kinds, and everything derived from it, so that it is
+        parsed again when next needed. Other data is kept."""
+        if not kinds:
+            return
+        kinds = affected(kinds)
+        ini.sections.cache_clear()  # holds every parsed INI; kinds still cached above it are not reparsed
+        if 'universe' in kinds:
+            fl.maps.generate_universe_graph.cache_clear()
+        if 'resources' in kinds:
+            dll.resource_table.clear()
+            for lookup in (dll.lookup, dll.lookup_as_html, dll.lookup_as_plain):
+                lookup.cache_clear()
+        for kind in kinds:
+            for name in ROUTINES[kind]:
+                getattr(fl.routines, name).cache_clear()
+        for cache, dependencies in DERIVED.items():
+            if kinds & dependencies:
+                cache.cache_clear()
+        snapshot.current.discard()
+
+    def swap(self, kinds: Set[str], data: dict):
+        """Replace the data of the given kinds with that in `data`, a snapshot loaded with `snapshot.load`. This only
+        touches dicts and caches, so is quick enough to do on the GUI thread, where no other reads can interleave."""
+        self.discard(kinds)
+        kinds = affected(kinds)
+        snapshot.current.serve({
+            'routines': {name: data['routines'][name] for kind in kinds for name in ROUTINES[kind]
+                         if name in data['routines']},
+            'contents': data['contents'] if 'universe' in kinds else {},
+            'resources': data['resources'] if 'resources' in kinds else {},
+        })
+
+
+def reparse(kinds: Set[str]) -> Optional[dict]:
+    """Parse the data of the given kinds, and of the kinds affected by them, afresh in a worker process, in the form
+    `GameFiles.swap` takes. Other kinds are not returned, and are only parsed where the kinds requested depend on
+    them. The data already loaded is untouched."""
+    kinds = affected(kinds)
+    routines = [name for kind in kinds for name in ROUTINES[kind] if name in snapshot.ROUTINES]
+    with workerPool(1) as executor:
+        pickled = executor.submit(snapshot.parseGameFiles, fl.paths.install, routines,
+                                  'universe' in kinds, 'resources' in kinds).result()
+    return snapshot.loads(pickled)
+
+
+def workerPool(workers: int) -> ProcessPoolExecutor:
+    """A pool of processes to parse the game files in, each set to the current install path. Workers are spawned
+    rather than forked, as the caller's process is multithreaded."""
+    return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=fl.paths.set_install_path, initargs=(fl.paths.install,))
+
+
+def parseInWorker(routines: Tuple[str, ...], contents: bool = False) -> bytes:
+    """Parse the results of the given flint routines, and the contents of every system if `contents` is true, in a
+    worker of `workerPool`. The result is served with `serveParsed`."""
+    return snapshot.parseGameFiles(fl.paths.install, routines, contents, resources=False)
+
+
+def serveParsed(pickled: bytes):
+    """Serve flint's routines from data returned by `parseInWorker`."""
+    snapshot.current.serve(snapshot.loads(pickled))
+
+
+def affected(kinds: Set[str]) -> Set[str]:
+    """The kinds of data affected by changes to files of the given kinds."""
+    if kinds & {'universe', 'goods'}:
+        return kinds | {'markets'}  # markets refer to bases and goods
+    return kinds
+
+
+gameFiles = GameFiles()
@@ -17,26 +17,39 @@ You should have received a copy of the GNU General Public License
 along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 
 This file contains the application's entry point - main().
+
+Only Qt-free modules are imported at module level. Worker processes
+started with the spawn method (the default on Windows) run this
+module's top level again, and importing `app` or `config` there would
+initialise a second application in every worker.
 """
+import multiprocessing
 import sys
 
-from PyQt5 import QtWidgets
-import flint as fl
-
-from wingman import app, config, IS_WIN, RESTART_EXIT_CODE  # non-relative imports for the benefit of PyInstaller
-from wingman.windows.main.layout import MainWindow
-from wingman.windows.boxes import configuration
-
-if IS_WIN:
-    import flair
+# non-relative imports for PyInstaller
+from wingman import IS_WIN, RESTART_EXIT_CODE
+from wingman.tracing import tracer
 
 
 def main() -> int:
     """Main application entry point."""
+    with tracer.span('import modules'):
+        from PyQt5 import QtWidgets
+        import flint as fl
+
+        from wingman import app, config, snapshot
+        from wingman.windows.main.layout import MainWindow
+        from wingman.windows.boxes import configuration
+
+        if IS_WIN:
+            import flair
+
     if not fl.paths.is_probably_freelancer(config.paths['freelancer_dir']):
         configuration.ConfigurePaths(mandatory=True).exec()
 
     fl.paths.set_install_path(config.paths['freelancer_dir'])
+    with tracer.span('restore snapshot'):
+        snapshot.restore()  # skip parsing if the game files are unchanged since the last start
 
     if IS_WIN:
         try:
@@ -60,9 +73,11 @@ def main() -> int:
 
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # allow worker processes to start in frozen builds
     result = RESTART_EXIT_CODE
     while result == RESTART_EXIT_CODE:
         result = main()
     if IS_WIN:
+        import flair
         flair.state.end_polling()
     sys.exit(result)
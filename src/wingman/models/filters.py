@@ -44,6 +44,15 @@ class TextFilter(QtCore.QSortFilterProxyModel):
         """Return the current query for the filter."""
         return self.filterRegExp().pattern()
 
+    def sort(self, column: int, order=QtCore.Qt.AscendingOrder):
+        """Let source models which can sort themselves more efficiently (those with a true `sortsItself` attribute) do
+        so, and present their rows in source order."""
+        if getattr(self.sourceModel(), 'sortsItself', False):
+            self.sourceModel().sort(column, order)
+            super().sort(-1)
+        else:
+            super().sort(column, order)
+
     def lessThan(self, left: QtCore.QModelIndex, right: QtCore.QModelIndex) -> bool:
         """Fix sorting. Unlike QStandardItemModel, QSortFilterProxyModel isn't smart enough to try and compare the
         items and only fall back to text when required. TODO: This workaround works, but means that sorting is slower
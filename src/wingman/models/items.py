@@ -16,13 +16,15 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Any, TypeVar, Optional
+from typing import Any, List, TypeVar, Optional
 
 from PyQt5 import QtGui, QtCore
 from dataclassy import dataclass
 import flint as fl
 import ago
 
+from .labels import baseLabel
+
 
 T = TypeVar('T')
 
@@ -122,7 +124,7 @@ class BaseItem(EntityItem):
     """An item holding a flint Base."""
     def __init__(self, base: fl.entities.Base):
         super().__init__(base)
-        self.setToolTip(f'Sector: {base.sector()}\nIFF: {base.owner().name()}')
+        self.setToolTip(baseLabel(base).tooltip())
 
 
 class FactionItem(EntityItem):
@@ -131,6 +133,13 @@ class FactionItem(EntityItem):
         super().__init__(faction)
 
 
+class ShipItem(EntityItem):
+    """An item holding a flint Ship."""
+    def __init__(self, ship: fl.entities.Ship):
+        super().__init__(ship)
+        self.setToolTip(f'Cargo hold: {ship.hold_size}')
+
+
 class CommodityItem(EntityItem):
     """An item holding a flint Commodity."""
     def __init__(self, commodity: fl.entities.Good):
@@ -175,6 +184,13 @@ class CreditsItem(NumberItem):
         return f'${credits_:,}'
 
 
+class RateItem(NumberItem):
+    """An item displaying a number as a rate in credits per minute."""
+    @staticmethod
+    def represent(rate):
+        return f'${rate:,.0f}/min'
+
+
 class ProfitItem(CreditsItem):
     """An item holding information about the profit of a transaction. It displays like a CreditsItem."""
     @dataclass(iter=True)
@@ -194,11 +210,12 @@ class ProfitItem(CreditsItem):
             """An HTML label that summarises this route."""
             price, base = (self.buyPrice, self.buyBase) if buy else (self.sellPrice, self.sellBase)
             transaction = 'Buy' if buy else 'Sell'
+            label = baseLabel(base)
             return '<br/>'.join([
                         f'<b>{transaction}: ${price:,}</b>',
-                        base.name(),
-                        f'{base.sector()}, {base.system().name()}',
-                        base.owner().name(),
+                        label.name,
+                        f'{label.sector}, {label.system}',
+                        label.owner,
             ])
 
     def __init__(self, *args):
@@ -214,6 +231,21 @@ class ProfitItem(CreditsItem):
         return self.getData().profit() < other.getData().profit()
 
 
+@dataclass
+class LoopData:
+    """Data for a loop, a circular trade route, as held by the loop table."""
+    profit: int
+    bases: List[fl.entities.BaseSolar]
+    commodities: List[fl.entities.Commodity]
+
+    def label(self) -> str:
+        """An HTML label that lists the legs of this loop."""
+        return '<br/>'.join(
+            f'<b>{commodity.name()}</b>: {baseLabel(origin).name} to {baseLabel(destination).name}'
+            for commodity, origin, destination in zip(self.commodities, self.bases, self.bases[1:] + self.bases[:1])
+        )
+
+
 class DateItem(NumberItem):
     """An item representing a date."""
     timer = QtCore.QTimer()
@@ -301,4 +333,4 @@ class MerchantItem(EntityItem):
     """Origin/destination item used in Merchant."""
     @staticmethod
     def represent(base: fl.entities.BaseSolar):
-        return f'{base.system().name()}: {base.name()} ({base.owner().short_name()})'
+        return baseLabel(base).merchant()
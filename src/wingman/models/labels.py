@@ -0,0 +1,83 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a table of the strings used to display bases.
+"""
+from typing import Dict, Union
+
+from dataclassy import dataclass
+from flint import cached
+import flint as fl
+
+
+@dataclass(slots=True)
+class BaseLabel:
+    """The strings used to display a base. Resolving these through flint involves several lookups (and a search of
+    the system's solars to find the base's), which is too slow to do for every cell of a table."""
+    name: str
+    system: str
+    region: str
+    sector: str
+    owner: str
+    ownerShort: str
+
+    def merchant(self) -> str:
+        """The label used for an origin or destination in Merchant."""
+        return f'{self.system}: {self.name} ({self.ownerShort})'
+
+    def tooltip(self) -> str:
+        """A tooltip summarising the base's location and owner."""
+        return f'Sector: {self.sector}\nIFF: {self.owner}'
+
+
+@cached
+def getBaseLabels() -> Dict[str, BaseLabel]:
+    """Labels for every base solar in the universe, keyed by its nickname. These are the bases the market index is
+    built from."""
+    return {base.nickname: makeLabel(base) for system in fl.systems for base in system.bases()}
+
+
+def makeLabel(base: fl.entities.BaseSolar) -> BaseLabel:
+    """Resolve the label for a base solar."""
+    system = base.system()
+    try:
+        owner = base.owner()
+    except KeyError:  # the solar's reputation names an undefined faction
+        owner = None
+    return BaseLabel(base.name(), system.name(), system.region(), base.sector(),
+                     owner.name() if owner else '', owner.short_name() if owner else '')
+
+
+@cached
+def getBaseSolars() -> Dict[str, fl.entities.BaseSolar]:
+    """The solar of each base, keyed by the base's nickname. Bases without a solar are omitted. This is much faster
+    than calling `Base.solar` for each base, which searches its system's contents."""
+    return {base.base: base for system in fl.systems for base in system.bases()}
+
+
+def baseLabel(base: Union[fl.entities.Base, fl.entities.BaseSolar]) -> BaseLabel:
+    """The label for a base, given either its BaseSolar or its Base. Labels for bases not in the table are resolved
+    when asked for."""
+    if isinstance(base, fl.entities.Base):
+        solar = getBaseSolars().get(base.nickname)
+        if solar is None:
+            system, owner = base.system_(), base.owner()
+            return BaseLabel(base.name(), system.name(), system.region(), '',
+                             owner.name() if owner else '', owner.short_name() if owner else '')
+        base = solar
+    return getBaseLabels().get(base.nickname) or makeLabel(base)
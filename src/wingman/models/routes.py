@@ -0,0 +1,249 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+"""
+from typing import Any, Callable, List, Optional
+
+from PyQt5 import QtCore
+import flint as fl
+import numpy as np
+
+from ..trade import Routes, Loop, MarketIndex, getMarketIndex
+from . import items
+
+
+class RouteTableModel(QtCore.QAbstractTableModel):
+    """A table model over Merchant's route arrays. Unlike a QStandardItemModel no item is created per cell: rows are
+    indices into a Routes object, and strings are only formatted when a view asks for a visible cell."""
+    HEADER = ['Commodity', 'Profit/unit', 'Profit/min', 'Origin', 'Destination']
+    sortsItself = True  # see TextFilter.sort
+
+    def __init__(self):
+        super().__init__()
+        self.market = None
+        self.routes = Routes(*(np.empty(0, dtype=np.intp) for _ in range(6)))
+        self.rates = np.empty(0)
+        self.rows = np.empty(0, dtype=np.intp)  # the indices of the routes shown, in display order
+
+    def setRoutes(self, routes: Routes, rates: np.ndarray, rows: np.ndarray, market: Optional[MarketIndex] = None):
+        """Show `rows` of `routes`, each of which has an estimated profit per minute given by `rates`. `market` is
+        the market index the routes were found in, by default that of the loaded game files."""
+        self.beginResetModel()
+        self.market = market or getMarketIndex()
+        self.routes, self.rates, self.rows = routes, rates, rows
+        self.endResetModel()
+
+    def extend(self, rows: np.ndarray):
+        """Show more rows of the current routes, after those already shown."""
+        if not len(rows):
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), len(self.rows), len(self.rows) + len(rows) - 1)
+        self.rows = np.concatenate([self.rows, rows])
+        self.endInsertRows()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADER)
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role=QtCore.Qt.DisplayRole) -> Any:
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADER[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        route, column = int(self.rows[index.row()]), index.column()
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return self.commodity(route).name()
+            if column == 1:
+                return f'${int(self.routes.profit[route]):,}'
+            if column == 2:
+                return items.RateItem.represent(float(self.rates[route]))
+            return items.MerchantItem.represent(self.base(route, origin=column == 3))
+
+        if role == QtCore.Qt.UserRole:  # the same data as the items Merchant used before this model
+            if column == 0:
+                return self.commodity(route)
+            if column == 1:
+                return items.ProfitItem.ProfitData(int(self.routes.buyPrice[route]), self.base(route, origin=True),
+                                                   int(self.routes.sellPrice[route]), self.base(route, origin=False),
+                                                   self.commodity(route))
+            if column == 2:
+                return float(self.rates[route])
+            return self.base(route, origin=column == 3)
+
+        if role == QtCore.Qt.ToolTipRole and column == 1:
+            return (f'Buy: ${self.routes.buyPrice[route]}\nSell: ${self.routes.sellPrice[route]}\n'
+                    f'Volume: {self.commodity(route).volume}')
+        return None
+
+    def sort(self, column: int, order=QtCore.Qt.AscendingOrder):
+        """Sort the rows shown by a column. Numeric columns are sorted directly on the route arrays; text columns
+        are sorted on the names of the distinct goods or bases involved rather than on formatted cells."""
+        if not len(self.rows):
+            return
+        keys: List[Callable[[np.ndarray], np.ndarray]] = [
+            lambda rows: self.rankNames(self.routes.good[rows], self.commodityName),
+            lambda rows: self.routes.profit[rows],
+            lambda rows: self.rates[rows],
+            lambda rows: self.rankNames(self.routes.origin[rows], self.baseName),
+            lambda rows: self.rankNames(self.routes.destination[rows], self.baseName),
+        ]
+        key = keys[column](self.rows)
+        permutation = np.argsort(-key if order == QtCore.Qt.DescendingOrder else key, kind='stable')
+
+        self.layoutAboutToBeChanged.emit()
+        oldPersistent = self.persistentIndexList()
+        position = np.empty_like(permutation)
+        position[permutation] = np.arange(len(permutation))
+        self.rows = self.rows[permutation]
+        self.changePersistentIndexList(oldPersistent, [self.index(int(position[i.row()]), i.column())
+                                                       for i in oldPersistent])
+        self.layoutChanged.emit()
+
+    def commodity(self, route: int):
+        """The commodity carried on a route."""
+        return self.market.goods[self.routes.good[route]].commodity()
+
+    def base(self, route: int, origin: bool):
+        """The origin or destination base of a route."""
+        return self.market.bases[(self.routes.origin if origin else self.routes.destination)[route]]
+
+    def commodityName(self, good: int) -> str:
+        """The name of the good with the given index."""
+        return self.market.goods[good].commodity().name()
+
+    def baseName(self, base: int) -> str:
+        """The name of the base with the given index, as displayed."""
+        return items.MerchantItem.represent(self.market.bases[base])
+
+    @staticmethod
+    def rankNames(values: np.ndarray, name: Callable[[int], str]) -> np.ndarray:
+        """Map each of `values` to the rank of its name among the names of the distinct values."""
+        distinct, inverse = np.unique(values, return_inverse=True)
+        names = [name(int(v)) for v in distinct]
+        ranks = np.empty(len(distinct), dtype=np.intp)
+        ranks[sorted(range(len(names)), key=names.__getitem__)] = np.arange(len(names))
+        return ranks[inverse]
+
+
+class LoopTableModel(QtCore.QAbstractTableModel):
+    """A table model over the loops found by a loop search. Its columns correspond to RouteTableModel's, so that the
+    table's selection is handled the same way: the commodities carried, the profit per unit, the estimated profit per
+    minute, the starting base and the bases visited after it."""
+    HEADER = ['Commodities', 'Profit/unit', 'Profit/min', 'Start', 'Via']
+    sortsItself = True  # see TextFilter.sort
+
+    def __init__(self):
+        super().__init__()
+        self.market = None
+        self.loops: List[Loop] = []
+        self.rates: List[float] = []  # estimated profit per minute of each loop
+
+    def clear(self, market: Optional[MarketIndex] = None):
+        """Remove all loops. `market` is the market index the next loops will be found in, by default that of the
+        loaded game files."""
+        self.beginResetModel()
+        self.market = market or getMarketIndex()
+        self.loops, self.rates = [], []
+        self.endResetModel()
+
+    def extend(self, loops: List[Loop], rates: List[float]):
+        """Show more loops, each of which has an estimated profit per minute given by `rates`."""
+        if not loops:
+            return
+        self.beginInsertRows(QtCore.QModelIndex(), len(self.loops), len(self.loops) + len(loops) - 1)
+        self.loops += loops
+        self.rates += rates
+        self.endInsertRows()
+
+    def rowCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.loops)
+
+    def columnCount(self, parent=QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADER)
+
+    def headerData(self, section: int, orientation: QtCore.Qt.Orientation, role=QtCore.Qt.DisplayRole) -> Any:
+        if orientation == QtCore.Qt.Horizontal and role == QtCore.Qt.DisplayRole:
+            return self.HEADER[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QtCore.QModelIndex, role=QtCore.Qt.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        loop = self.loops[row]
+
+        if role == QtCore.Qt.DisplayRole:
+            if column == 0:
+                return ' → '.join(c.name() for c in self.commodities(loop))
+            if column == 1:
+                return f'${loop.profit:,}'
+            if column == 2:
+                return items.RateItem.represent(self.rates[row])
+            if column == 3:
+                return items.MerchantItem.represent(self.bases(loop)[0])
+            return ' → '.join(items.MerchantItem.represent(b) for b in self.bases(loop)[1:])
+
+        if role == QtCore.Qt.UserRole:
+            if column == 0:
+                return self.commodities(loop)
+            if column == 1:
+                return items.LoopData(loop.profit, self.bases(loop), self.commodities(loop))
+            if column == 2:
+                return self.rates[row]
+            if column == 3:
+                return self.bases(loop)[0]
+            return self.bases(loop)[1:]
+
+        if role == QtCore.Qt.ToolTipRole and column == 1:
+            return f'{len(loop.bases)} legs'
+        return None
+
+    def sort(self, column: int, order=QtCore.Qt.AscendingOrder):
+        """Sort the loops by a column. Numeric columns are sorted by value; text columns by the sequence of names
+        displayed."""
+        keys: List[Callable[[int], Any]] = [
+            lambda row: [c.name() for c in self.commodities(self.loops[row])],
+            lambda row: self.loops[row].profit,
+            lambda row: self.rates[row],
+            lambda row: items.MerchantItem.represent(self.bases(self.loops[row])[0]),
+            lambda row: [items.MerchantItem.represent(b) for b in self.bases(self.loops[row])[1:]],
+        ]
+        permutation = sorted(range(len(self.loops)), key=keys[column], reverse=order == QtCore.Qt.DescendingOrder)
+
+        self.layoutAboutToBeChanged.emit()
+        oldPersistent = self.persistentIndexList()
+        position = {old: new for new, old in enumerate(permutation)}
+        self.loops = [self.loops[i] for i in permutation]
+        self.rates = [self.rates[i] for i in permutation]
+        self.changePersistentIndexList(oldPersistent, [self.index(position[i.row()], i.column())
+                                                       for i in oldPersistent])
+        self.layoutChanged.emit()
+
+    def bases(self, loop: Loop) -> List[fl.entities.BaseSolar]:
+        """The bases a loop visits, in order."""
+        return [self.market.bases[b] for b in loop.bases]
+
+    def commodities(self, loop: Loop) -> List[fl.entities.Commodity]:
+        """The commodities carried on each leg of a loop."""
+        return [self.market.goods[g].commodity() for g in loop.goods]
@@ -19,7 +19,7 @@ along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 from PyQt5 import QtGui
 import flint as fl
 
-from .items import SystemItem, FactionItem
+from .items import SystemItem, FactionItem, ShipItem
 
 
 class SystemSelectionModel(QtGui.QStandardItemModel):
@@ -35,3 +35,11 @@ class FactionSelectionModel(QtGui.QStandardItemModel):
         super().__init__()
         for group in sorted(fl.factions, key=lambda f: f.name()):
             self.appendRow(FactionItem(group))
+
+
+class ShipSelectionModel(QtGui.QStandardItemModel):
+    def __init__(self):
+        super().__init__()
+        for ship in sorted(fl.ships, key=lambda s: s.name()):
+            if ship.hold_size and ship.name():
+                self.appendRow(ShipItem(ship))
@@ -27,6 +27,8 @@ from io import BytesIO
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PIL import Image, ImageQt
 
+from .tracing import tracer
+
 
 class Configuration(configparser.ConfigParser):
     """A class providing a persistent configuration store. The configuration is written to storage on program exit.
@@ -113,6 +115,7 @@ class Icons:
         self.copy = QtGui.QIcon.fromTheme('edit-copy')
 
     @staticmethod
+    @tracer.traced('Icons.determineLuminance')
     def determineLuminance(threshold=200) -> bool:
         """Determine whether this platform has a light or dark theme by testing the background colour of a push
         button. `threshold` is the threshold average luminance to be considered a "bright" theme."""
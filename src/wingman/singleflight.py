@@ -0,0 +1,108 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a guard which ensures that concurrent calls to a
+cached loader share a single load, rather than each parsing the same
+files.
+"""
+from typing import Callable, Dict, Set, Tuple
+from concurrent.futures import Future
+import functools
+import logging
+import os
+import threading
+import time
+import weakref
+
+
+class SingleFlight:
+    """Wraps a cached function (one decorated with `flint.cached`) so that while it is being called with some
+    arguments, other threads calling it with the same arguments wait for that call's result instead of making
+    their own. lru_cache alone does not do this: every caller that misses the cache computes the result."""
+
+    def __init__(self, function: Callable):
+        functools.update_wrapper(self, function)
+        self.function = function
+        self.lock = threading.Lock()
+        self.inFlight: Dict[Tuple, Tuple[Future, int]] = {}  # arguments -> (result, ident of the loading thread)
+        self.loaded: Set[Tuple] = set()  # arguments whose results the wrapped function has cached
+        self.waits = 0
+        self.waited = 0.0  # total time spent waiting, in seconds
+        instances.add(self)
+
+    def __call__(self, *args):
+        if args in self.loaded:
+            if self.function.cache_info().currsize:  # the result is cached, so there's nothing to wait for
+                return self.function(*args)
+            self.loaded.clear()  # the cache has been cleared, e.g. by flint.invalidate_cache
+        with self.lock:
+            future, loader = self.inFlight.get(args, (None, None))
+            if future is None:
+                future = Future()
+                self.inFlight[args] = future, threading.get_ident()
+        if loader is None:
+            return self.load(args, future)
+        if loader == threading.get_ident():  # a recursive call; waiting would deadlock
+            return self.function(*args)
+        return self.wait(future)
+
+    def load(self, args: Tuple, future: Future):
+        """Call the function, sharing the result with any threads that call it meanwhile."""
+        try:
+            future.set_result(self.function(*args))
+            self.loaded.add(args)
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                del self.inFlight[args]
+        return future.result()
+
+    def wait(self, future: Future):
+        """Wait for the result of a call in progress in another thread."""
+        logging.debug(f'Waiting for {self.__name__} to be loaded by another thread')
+        start = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            waited = time.perf_counter() - start
+            with self.lock:
+                self.waits += 1
+                self.waited += waited
+            logging.debug(f'Waited {waited:.3f} s for {self.__name__} ({self.waits} waits, {self.waited:.3f} s total)')
+
+    def cache_info(self):
+        """The wrapped function's cache statistics."""
+        return self.function.cache_info()
+
+    def cache_clear(self):
+        """Clear the wrapped function's cache."""
+        self.loaded.clear()
+        self.function.cache_clear()
+
+    def reset(self):
+        """Forget calls in progress. Called in a forked child process, whose copies of other threads' calls will
+        never finish."""
+        self.lock = threading.Lock()
+        self.inFlight = {}
+
+
+instances: 'weakref.WeakSet[SingleFlight]' = weakref.WeakSet()
+
+if hasattr(os, 'register_at_fork'):  # not available on Windows, which doesn't fork
+    os.register_at_fork(after_in_child=lambda: [i.reset() for i in instances])
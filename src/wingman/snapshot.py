@@ -0,0 +1,210 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a snapshot of the game data parsed by flint, saved
+to the app data directory so that later starts can skip parsing.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+from collections import defaultdict
+import copyreg
+import functools
+import io
+import logging
+import os
+import pickle
+
+from flint import cached
+from flint.formats import dll
+import flint as fl
+
+from . import __version__
+from .singleflight import SingleFlight
+from .trade.persistence import fingerprint, cachePath, prepareCachePath
+
+# flint routines whose results are saved. Each takes no arguments
+ROUTINES = ('get_systems', 'get_bases', 'get_factions', 'get_equipment', 'get_goods', 'get_ships', 'get_markets')
+
+
+def posVector(*xyz) -> fl.maps.PosVector:
+    """Recreate a PosVector, which pickle cannot find by its name."""
+    return fl.maps.PosVector(*xyz)
+
+
+def rotVector(*xyz) -> fl.maps.RotVector:
+    """Recreate a RotVector, which pickle cannot find by its name."""
+    return fl.maps.RotVector(*xyz)
+
+
+class Pickler(pickle.Pickler):
+    """A pickler for flint's entities."""
+    dispatch_table = {
+        **copyreg.dispatch_table,
+        fl.maps.PosVector: lambda v: (posVector, tuple(v)),
+        fl.maps.RotVector: lambda v: (rotVector, tuple(v)),
+    }
+
+
+class Snapshot:
+    """Serves flint's routines from a snapshot until flint's cache is next invalidated, after which they parse the
+    game files again. Routines are wrapped once, by `install`, because flint's caches cannot be filled directly.
+    Wrapped routines are also guarded by `SingleFlight`, as they are called from both the loading and GUI threads."""
+
+    def __init__(self):
+        self.routines: Dict[str, Any] = {}
+        self.contents: Dict[str, fl.entities.EntitySet] = {}  # system nickname -> system contents
+        self.installed = False
+        self.restored = False  # whether the data currently loaded came from a snapshot
+
+    def install(self):
+        """Replace flint's routines with ones that return the snapshot's data, if there is any."""
+        if self.installed:
+            return
+        for name in ROUTINES:
+            self.wrap(name, lambda original, name=name: lambda: self.routines.pop(name, None) or original())
+        self.wrap('get_system_contents',
+                  lambda original: lambda system: self.contents.pop(system.nickname, None) or original(system))
+        self.installed = True
+
+    @staticmethod
+    def wrap(name: str, replace: Callable[[Callable], Callable]):
+        """Replace the flint routine `name`, everywhere it is looked up, with the result of calling `replace` with
+        the original routine's uncached function. Clearing the replacement's cache is then enough to reparse."""
+        original = getattr(fl.routines, name)
+        routine = SingleFlight(cached(functools.wraps(original)(replace(original.__wrapped__))))
+        setattr(fl.routines, name, routine)
+        if hasattr(fl, name):
+            setattr(fl, name, routine)
+        shorthand = name[len('get_'):]
+        if shorthand in fl.shorthand:
+            fl.shorthand[shorthand] = routine
+
+    def serve(self, data: dict):
+        """Serve flint's routines from `data`, as returned by `load`. Routines whose caches are still populated
+        continue to return their cached results until cleared."""
+        self.install()
+        self.routines.update(data['routines'])
+        self.contents.update(data['contents'])
+        dll.resource_table.update(data['resources'])
+
+    def discard(self):
+        """Discard data not yet served, so that the game files are parsed for it instead."""
+        self.routines.clear()
+        self.contents.clear()
+        self.restored = False
+
+    def cache_clear(self):
+        """Called by `fl.invalidate_cache`. Discard data not yet served, so that the game files are parsed again.
+        Snapshots on disk are kept: one made from other game files has another key so is never loaded, and is
+        removed when the next snapshot is saved. (`set_install_path` invalidates the cache at every start.)"""
+        self.discard()
+
+
+current = Snapshot()  # the snapshot flint's routines are served from
+fl.central_cache.add(current)  # so that reloading the game files also discards the snapshot
+
+
+def sourceFiles() -> Iterator[str]:
+    """Every file in the game's DATA directory, plus the resource DLLs."""
+    for directory, _, files in os.walk(os.path.join(fl.paths.install, 'DATA')):
+        for file in files:
+            yield os.path.join(directory, file)
+    yield from fl.paths.dlls.values()
+
+
+def snapshotKey() -> str:
+    """The fingerprint of the game files a snapshot was made from."""
+    return fingerprint(sourceFiles())
+
+
+def load(path: str) -> Optional[dict]:
+    """Read the snapshot at `path`, or return None if it is missing, unreadable or from another version."""
+    try:
+        with open(path, 'rb') as f:
+            return prepare(pickle.load(f))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logging.exception('Snapshot of game data unreadable, ignoring')
+        return None
+
+
+def loads(pickled: bytes) -> Optional[dict]:
+    """Like `load`, but for data returned by `parseGameFiles`."""
+    return prepare(pickle.loads(pickled))
+
+
+def prepare(data: dict) -> Optional[dict]:
+    """Ready unpickled data to be served, or return None if it is from another version."""
+    if data['version'] != __version__:
+        return None
+    if 'get_markets' in data['routines']:
+        data['routines']['get_markets'] = defaultdict(lambda: {True: {}, False: {}}, data['routines']['get_markets'])
+    return data
+
+
+def collect(routines: Iterable[str], contents: bool, resources: bool) -> dict:
+    """The results of the given flint routines, plus the contents of every system and every resource, if requested,
+    in the form `serve` takes. Anything not yet loaded is parsed."""
+    if resources:
+        dll.dump_all()  # loads every resource DLL
+    data = {
+        'version': __version__,
+        'routines': {name: getattr(fl.routines, name)() for name in routines},
+        'contents': {s.nickname: s.contents() for s in fl.systems} if contents else {},
+        'resources': dict(dll.resource_table) if resources else {},
+    }
+    if 'get_markets' in data['routines']:
+        data['routines']['get_markets'] = dict(data['routines']['get_markets'])
+    return data
+
+
+def restore() -> bool:
+    """Serve flint's routines from the snapshot for the current game files, if one has been saved. Return whether
+    it was."""
+    current.install()  # before anything is loaded, as installing discards what flint has cached
+    if fl.routines.get_systems.cache_info().currsize:
+        return False  # already loaded in this process
+    data = load(cachePath('snapshot', snapshotKey(), '.pickle'))
+    if data is None:
+        return False
+    current.serve(data)
+    current.restored = True
+    logging.info('Game data restored from snapshot')
+    return True
+
+
+def save() -> str:
+    """Save a snapshot of the game data and return its path. Anything not yet loaded, including every resource DLL,
+    is parsed first, so this is best called once loading has finished."""
+    data = collect(ROUTINES, contents=True, resources=True)
+    path = prepareCachePath('snapshot', snapshotKey(), '.pickle')
+    with open(path, 'wb') as f:
+        Pickler(f, pickle.HIGHEST_PROTOCOL).dump(data)
+    logging.info('Snapshot of game data saved')
+    return path
+
+
+def parseGameFiles(installPath: str, routines: Iterable[str], contents: bool, resources: bool) -> bytes:
+    """Parse only the data requested (see `collect`) from the game files at `installPath`, and return it pickled,
+    to be read with `loads`. This runs in a worker process, so that the data already loaded is untouched until the
+    result is served. Data the requested routines depend on is parsed too, but not returned."""
+    fl.paths.set_install_path(installPath)
+    fl.invalidate_cache()  # a forked worker inherits its parent's caches
+    buffer = io.BytesIO()
+    Pickler(buffer, pickle.HIGHEST_PROTOCOL).dump(collect(routines, contents, resources))
+    return buffer.getvalue()
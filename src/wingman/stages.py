@@ -0,0 +1,120 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a scheduler that runs the stages of loading game
+data as a graph of dependencies, parsing independent stages at once
+in worker processes.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+import logging
+import time
+
+from dataclassy import dataclass
+
+from .tracing import tracer
+
+
+@dataclass
+class Stage:
+    """A unit of loading. `function` is called once every stage named in `after` has finished. If given, `parse` is
+    called in a worker process as soon as the stages are run, and its result received before `function` is called.
+    It must be picklable, and must not depend on the results of other stages."""
+    name: str
+    function: Callable[[], object]
+    after: Tuple[str, ...] = ()
+    parse: Optional[Callable[[], Any]] = None
+
+
+class StageGraph:
+    """A set of stages forming a directed acyclic graph of dependencies."""
+
+    def __init__(self, stages: Iterable[Stage]):
+        self.stages: Dict[str, Stage] = {s.name: s for s in stages}
+        self.timings: Dict[str, Tuple[float, float]] = {}  # name -> (start, end), in seconds since run started
+        self.order()  # validate
+
+    def order(self) -> List[str]:
+        """The names of the stages in an order in which they could be run one at a time."""
+        result, visiting = [], set()
+
+        def visit(name: str):
+            if name in result:
+                return
+            if name in visiting:
+                raise ValueError(f'stage {name!r} is part of a dependency cycle')
+            if name not in self.stages:
+                raise ValueError(f'no stage named {name!r}')
+            visiting.add(name)
+            for dependency in self.stages[name].after:
+                visit(dependency)
+            result.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return result
+
+    def run(self, onFinished: Callable[[str], None] = lambda name: None, executor: Optional[Executor] = None,
+            receive: Callable[[Any], None] = lambda result: None):
+        """Run every stage, calling `onFinished` with the name of each stage as it finishes. If `executor` is given,
+        the `parse` of every stage is submitted to it at once, and each result is passed to `receive` once the
+        stage's dependencies have finished. Otherwise the stages' functions parse everything themselves.
+
+        Functions are called one at a time in this thread, each as soon as its dependencies have finished and its
+        parse has been received. An exception raised by a stage or its parse is raised here, and the stages not yet
+        run are not."""
+        self.timings.clear()
+        started = time.perf_counter()
+        parsing = {name: executor.submit(stage.parse) for name, stage in self.stages.items()
+                   if executor is not None and stage.parse is not None}
+        finished, pending = set(), self.order()
+        try:
+            while pending:
+                ready = [n for n in pending if finished.issuperset(self.stages[n].after)
+                         and (n not in parsing or parsing[n].done())]
+                if not ready:  # the first pending stage's dependencies have finished, so its parse must be running
+                    wait([parsing[n] for n in pending if n in parsing and not parsing[n].done()],
+                         return_when=FIRST_COMPLETED)
+                    continue
+                name = ready[0]
+                pending.remove(name)
+                start = time.perf_counter() - started
+                with tracer.span(f'stage {name}', 'loading'):
+                    if name in parsing:
+                        receive(parsing[name].result())
+                    self.stages[name].function()
+                self.timings[name] = start, time.perf_counter() - started
+                finished.add(name)
+                onFinished(name)
+        finally:
+            for future in parsing.values():
+                future.cancel()
+
+    def summary(self) -> str:
+        """A table of when each stage of the last run started and finished, and how long it took."""
+        lines = [f'{"stage":<12} {"start":>8} {"end":>8} {"time":>8}']
+        for name, (start, end) in sorted(self.timings.items(), key=lambda t: t[1]):
+            lines.append(f'{name:<12} {start:8.3f} {end:8.3f} {end - start:8.3f}')
+        if self.timings:
+            lines.append(f'{"total":<12} {"":>8} {max(e for _, e in self.timings.values()):8.3f}')
+        return '\n'.join(lines)
+
+    def log(self):
+        """Log the timings of the last run."""
+        for line in self.summary().splitlines():
+            logging.info(line)
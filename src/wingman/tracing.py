@@ -0,0 +1,109 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a tracer that records how long each phase of
+startup takes. It is enabled by setting the environment variable
+WINGMAN_TRACE or passing --trace, and writes a Chrome trace (open it
+in chrome://tracing or Perfetto) and a summary to the app data dir.
+"""
+from typing import Callable, List, Tuple
+import contextlib
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+from . import STARTED, TRACE_FILE, TRACE_SUMMARY_FILE
+
+Span = Tuple[str, str, float, float, int]  # name, category, start, end (seconds since STARTED), thread id
+
+
+class Tracer:
+    """Records spans of time. When disabled, spans cost a single attribute check."""
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+        self.written = False
+
+    @contextlib.contextmanager
+    def span(self, name: str, category: str = 'startup'):
+        """Record the time spent in the body of a with statement."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter() - STARTED
+        try:
+            yield
+        finally:
+            self.record(name, category, start, time.perf_counter() - STARTED)
+
+    def traced(self, name: str, category: str = 'startup') -> Callable[[Callable], Callable]:
+        """A decorator recording the time spent in each call of a function."""
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name, category):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name: str, category: str, start: float, end: float):
+        """Record a span that has already finished. Times are in seconds since STARTED."""
+        if self.enabled:
+            with self.lock:
+                self.spans.append((name, category, start, end, threading.get_ident()))
+
+    def write(self):
+        """Write the spans recorded so far to the app data directory, once."""
+        if not self.enabled or self.written:
+            return
+        self.written = True
+        with self.lock:
+            spans = sorted(self.spans, key=lambda s: (s[2], -s[3]))
+
+        threads = {tid: i for i, tid in enumerate(dict.fromkeys(s[4] for s in spans))}
+        events = [{'name': name, 'cat': category, 'ph': 'X', 'pid': os.getpid(), 'tid': threads[tid],
+                   'ts': round(start * 1e6), 'dur': round((end - start) * 1e6)}  # in microseconds
+                  for name, category, start, end, tid in spans]
+        with open(TRACE_FILE, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+        with open(TRACE_SUMMARY_FILE, 'w') as f:
+            f.write(self.summary(spans, threads))
+        logging.info(f'Startup trace written to {os.path.abspath(TRACE_FILE)}')
+
+    @staticmethod
+    def summary(spans: List[Span], threads: dict) -> str:
+        """A plain-text table of spans, indented to show nesting within each thread."""
+        lines = [f'{"start (ms)":>10} {"time (ms)":>10}  thread  span']
+        enclosing = {tid: [] for tid in threads}  # the ends of the spans enclosing the current one, per thread
+        for name, category, start, end, tid in spans:
+            stack = enclosing[tid]
+            while stack and stack[-1] <= start:
+                stack.pop()
+            lines.append(f'{start * 1e3:10.1f} {(end - start) * 1e3:10.1f}  {threads[tid]:>6}  '
+                         f'{"  " * len(stack)}{name} [{category}]')
+            stack.append(end)
+        return '\n'.join(lines) + '\n'
+
+
+tracer = Tracer(enabled=bool(os.environ.get('WINGMAN_TRACE')) or '--trace' in sys.argv)
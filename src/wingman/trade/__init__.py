@@ -0,0 +1,31 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This package contains Merchant's trade logic. Nothing in it may
+depend on Qt.
+"""
+from .engine import PriceMatrix, Routes
+from .index import MarketIndex, getMarketIndex
+from .docking import DockingMatrix, getDockingMatrix
+from .jumps import JumpTable, getJumpTable
+from .travel import TravelTimes, getTravelTimes
+from .loops import Loop, LoopFinder, getLoopFinder, mergeLoops
+from .cargo import CargoPlan, optimiseCargo
+from .queries import findRoutes, routesBetween, routeCacheStatistics, correctPrice
+from .overrides import PriceOverrides, getPriceOverrides
+from .heatmap import Heatmap, getHeatmap, heatmapReady
@@ -0,0 +1,87 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines an optimiser for filling a cargo hold.
+"""
+from typing import Dict
+
+from dataclassy import dataclass
+import numpy as np
+
+from .engine import PriceMatrix
+
+
+@dataclass
+class CargoPlan:
+    """The cargo to buy for a single run. Goods are indices into the PriceMatrix the plan was made from."""
+    quantities: Dict[int, int]  # good -> units to buy
+    profit: int = 0
+    cost: int = 0
+    volume: int = 0
+
+
+def optimiseCargo(matrix: PriceMatrix, origin: int, destination: int, holdSize: int, budget: int) -> CargoPlan:
+    """Find a mix of commodities bought at the base with index `origin` and sold at `destination` that makes (close
+    to) the most profit in one run, given a hold of `holdSize` units of volume and `budget` credits.
+
+    This is an integer knapsack problem with two constraints. Its linear relaxation always has an optimal solution
+    that uses at most two goods (one per binding constraint), so every single good and every pair of goods is
+    evaluated at once. Each candidate is rounded down and topped up with the best single good that still fits, and
+    the most profitable is chosen. Rounding means the result is not guaranteed optimal, but it is always feasible."""
+    goods = np.flatnonzero(matrix.sold[:, origin] & matrix.bought[:, destination]
+                           & (matrix.buys[:, destination] > matrix.sells[:, origin]))
+    if not len(goods) or holdSize <= 0 or budget <= 0:
+        return CargoPlan({})
+
+    cost = matrix.sells[goods, origin].astype(np.float64)
+    profit = matrix.buys[goods, destination] - matrix.sells[goods, origin]
+    volume = np.maximum(matrix.volumes[goods], 1).astype(np.float64)
+
+    # candidate quantities for each (i, j) pair; the diagonal holds single-good solutions
+    determinant = volume[:, np.newaxis] * cost[np.newaxis, :] - volume[np.newaxis, :] * cost[:, np.newaxis]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        first = (holdSize * cost[np.newaxis, :] - budget * volume[np.newaxis, :]) / determinant
+        second = (budget * volume[:, np.newaxis] - holdSize * cost[:, np.newaxis]) / determinant
+    feasible = (determinant != 0) & (first >= 0) & (second >= 0)
+    first, second = np.where(feasible, np.floor(first), 0), np.where(feasible, np.floor(second), 0)
+    single = np.minimum(holdSize // volume, budget // cost)
+    np.fill_diagonal(first, single)
+    np.fill_diagonal(second, 0)
+
+    # top up each candidate with whichever single good adds the most profit in the space and credits left over
+    spareHold = holdSize - first * volume[:, np.newaxis] - second * volume[np.newaxis, :]
+    spareBudget = budget - first * cost[:, np.newaxis] - second * cost[np.newaxis, :]
+    extra = np.maximum(np.minimum(spareHold[..., np.newaxis] // volume, spareBudget[..., np.newaxis] // cost), 0)
+    extraProfit = extra * profit
+    best = extraProfit.argmax(axis=2)
+    extra = np.take_along_axis(extra, best[..., np.newaxis], axis=2)[..., 0]
+
+    total = first * profit[:, np.newaxis] + second * profit[np.newaxis, :] + extra * profit[best]
+    i, j = np.unravel_index(total.argmax(), total.shape)
+
+    quantities = {}
+    for good, quantity in ((i, first[i, j]), (j, second[i, j]), (best[i, j], extra[i, j])):
+        if quantity > 0:
+            quantities[int(goods[good])] = quantities.get(int(goods[good]), 0) + int(quantity)
+
+    return CargoPlan(
+        quantities,
+        profit=int(sum(q * (matrix.buys[g, destination] - matrix.sells[g, origin]) for g, q in quantities.items())),
+        cost=int(sum(q * matrix.sells[g, origin] for g, q in quantities.items())),
+        volume=int(sum(q * max(matrix.volumes[g], 1) for g, q in quantities.items())),
+    )
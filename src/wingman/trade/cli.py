@@ -0,0 +1,165 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file contains the entry point for wingman-trade, which runs
+Merchant's queries from the command line without starting Qt.
+"""
+from typing import Iterator, List, Optional, Tuple
+import argparse
+import configparser
+import itertools
+import json
+import logging
+import os
+import sys
+
+import flint as fl
+
+from .. import __app__, CONFIG_FILE
+from .queries import routesBetween
+from .travel import getTravelTimes
+from .index import getMarketIndex
+
+Query = Tuple[fl.entities.System, Optional[fl.entities.System], Optional[fl.entities.Faction]]
+
+
+def dataLocation() -> str:
+    """The app data directory, as Qt's QStandardPaths.AppLocalDataLocation would give it for the application."""
+    if sys.platform == 'win32':
+        root = os.environ.get('LOCALAPPDATA', os.path.expanduser('~/AppData/Local'))
+    elif sys.platform == 'darwin':
+        root = os.path.expanduser('~/Library/Application Support')
+    else:
+        root = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(root, __app__.lower())
+
+
+def configuredFreelancerDir(dataDir: str) -> Optional[str]:
+    """The Freelancer directory set in the application's configuration, if any."""
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read(os.path.join(dataDir, CONFIG_FILE))
+    return config.get('paths', 'freelancer_dir', fallback=None) or None
+
+
+def parseArguments(arguments: Optional[List[str]]) -> argparse.Namespace:
+    """Parse and validate command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='wingman-trade',
+        description="Find the most profitable trade routes, as Wingman's Merchant tab does. Each query is the "
+                    'combination of an origin system, a destination system (or any) and an IFF to dock as (or '
+                    'any). Every combination of the given systems and IFFs is queried. Results are written to stdout '
+                    'as JSON lines, one per route.')
+    parser.add_argument('-o', '--origin', action='append', default=[], metavar='SYSTEM',
+                        help='nickname of an origin system (repeatable)')
+    parser.add_argument('-d', '--destination', action='append', default=[], metavar='SYSTEM',
+                        help='nickname of a destination system (repeatable; default: any base)')
+    parser.add_argument('-i', '--iff', action='append', default=[], metavar='FACTION',
+                        help='nickname of a faction whose docking rights apply (repeatable; default: none)')
+    parser.add_argument('-b', '--batch', type=argparse.FileType('r'), metavar='FILE',
+                        help='read further queries from a file ("-" for stdin) of JSON objects, one per line, with an '
+                             '"origin" key and optionally "destination" and "iff" keys')
+    parser.add_argument('-n', '--limit', type=int, default=20, help='routes to output per query (default: %(default)s)')
+    parser.add_argument('--rank-by-time', action='store_true', help='rank routes by profit per minute, not per unit')
+    parser.add_argument('--cruise-speed', type=int, default=fl.maps.DEFAULT_CRUISE_SPEED,
+                        help='cruise speed used to estimate travel times, in m/s (default: %(default)s)')
+    parser.add_argument('--freelancer-dir', help="path to Freelancer (default: the path set in Wingman's config)")
+    parser.add_argument('--data-dir', default=dataLocation(),
+                        help="Wingman's data directory, where cached data is kept (default: %(default)s)")
+    parsed = parser.parse_args(arguments)
+
+    parsed.freelancer_dir = parsed.freelancer_dir or configuredFreelancerDir(parsed.data_dir)
+    if not parsed.freelancer_dir or not fl.paths.is_probably_freelancer(parsed.freelancer_dir):
+        parser.error('a valid --freelancer-dir must be given, or set in Wingman')
+    if not parsed.origin and not parsed.batch:
+        parser.error('at least one --origin or a --batch file is required')
+    return parsed
+
+
+def lookup(kind: str, nickname: Optional[str]):
+    """Resolve a system or faction nickname to its entity."""
+    if nickname is None:
+        return None
+    entity = getattr(fl, kind).get(nickname)
+    if entity is None:
+        raise ValueError(f'no {kind[:-1]} with nickname {nickname!r}')
+    return entity
+
+
+def generateQueries(arguments: argparse.Namespace) -> Iterator[Query]:
+    """Generate the queries given on the command line, then those in the batch file."""
+    for origin, destination, iff in itertools.product(arguments.origin, arguments.destination or [None],
+                                                      arguments.iff or [None]):
+        yield lookup('systems', origin), lookup('systems', destination), lookup('factions', iff)
+    for line in arguments.batch or ():
+        if line.strip():
+            query = json.loads(line)
+            if 'origin' not in query:
+                raise ValueError(f'query has no origin: {line.strip()}')
+            yield (lookup('systems', query['origin']), lookup('systems', query.get('destination')),
+                   lookup('factions', query.get('iff')))
+
+
+def runQuery(query: Query, limit: int, rankByTime: bool, cruiseSpeed: int) -> Iterator[dict]:
+    """Run a query, yielding its best routes as dicts ready to be serialised."""
+    origin, destination, iff = query
+    index = getMarketIndex()
+    routes = routesBetween(origin, destination, iff)
+    rates = routes.profit / (getTravelTimes().estimate(routes.origin, routes.destination, cruiseSpeed) / 60)
+    description = {'origin': origin.nickname, 'destination': destination.nickname if destination else None,
+                   'iff': iff.nickname if iff else None}
+
+    for rank, r in enumerate(routes.ranked(0, limit, by=rates if rankByTime else None).tolist()):
+        yield {
+            'query': description,
+            'rank': rank,
+            'commodity': index.goods[routes.good[r]].commodity().nickname,
+            'origin': index.bases[routes.origin[r]].nickname,
+            'destination': index.bases[routes.destination[r]].nickname,
+            'buy_price': int(routes.buyPrice[r]),
+            'sell_price': int(routes.sellPrice[r]),
+            'profit': int(routes.profit[r]),
+            'profit_per_minute': round(float(rates[r]), 2),
+        }
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    """Entry point for wingman-trade."""
+    logging.basicConfig(level=logging.WARNING, format='[%(levelname)s] %(message)s')
+    arguments = parseArguments(arguments)
+
+    # share the GUI's cache directory, which is relative to the data directory
+    freelancerDir = os.path.abspath(arguments.freelancer_dir)
+    os.makedirs(arguments.data_dir, exist_ok=True)
+    os.chdir(arguments.data_dir)
+    fl.paths.set_install_path(freelancerDir)
+
+    try:
+        for query in generateQueries(arguments):
+            for route in runQuery(query, arguments.limit, arguments.rank_by_time, arguments.cruise_speed):
+                print(json.dumps(route), flush=True)
+    except ValueError as e:
+        print(f'wingman-trade: error: {e}', file=sys.stderr)
+        return 2
+    except BrokenPipeError:  # e.g. piped into head
+        sys.stderr.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a precomputed matrix of docking permissions.
+"""
+from typing import List
+
+from flint import cached
+import flint as fl
+import numpy as np
+
+from .index import getMarketIndex
+
+
+class DockingMatrix:
+    """A factions × bases bitset where bit [f, b] is set if faction f can dock at base b. Each row is packed into
+    bytes, so the whole matrix for a universe of a few thousand bases and factions takes well under a megabyte."""
+
+    def __init__(self, factions: List[fl.entities.Faction], docking: np.ndarray):
+        self.factions = factions
+        self.factionIndex = {f: i for i, f in enumerate(factions)}
+        self.baseCount = docking.shape[1]
+        self.bits = np.packbits(docking, axis=1)
+
+    @classmethod
+    def fromFactions(cls, factions: List[fl.entities.Faction], bases: List[fl.entities.BaseSolar]) -> 'DockingMatrix':
+        """Construct a docking matrix for the given factions and bases. This is equivalent to calling
+        `Faction.can_dock_at` for every pair, except that a faction with no opinion of a base's owner (or a base
+        owned by an unknown faction) is treated as neutral rather than raising an error."""
+        factionIndex = {f.nickname: i for i, f in enumerate(factions)}
+
+        reputations = np.zeros((len(factions), len(factions) + 1), dtype=np.float32)  # last column is "unknown"
+        for i, faction in enumerate(factions):
+            for rep, other in faction.rep:
+                if other in factionIndex:
+                    reputations[i, factionIndex[other]] = rep
+
+        owners = np.array([factionIndex.get(b.reputation, len(factions)) for b in bases], dtype=np.intp)
+        return cls(factions, reputations[:, owners] > fl.entities.Faction.NODOCK_REP)
+
+    def mask(self, faction: fl.entities.Faction) -> np.ndarray:
+        """A boolean mask over all bases which is true where `faction` can dock."""
+        return np.unpackbits(self.bits[self.factionIndex[faction]], count=self.baseCount).view(bool)
+
+
+@cached
+def getDockingMatrix() -> DockingMatrix:
+    """The docking matrix for every faction against every base in the market index."""
+    return DockingMatrix.fromFactions(list(fl.factions), getMarketIndex().bases)
@@ -0,0 +1,128 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines the price matrix engine used to find trade routes.
+"""
+from typing import Iterable, List, Optional
+
+from dataclassy import dataclass
+import flint as fl
+import numpy as np
+
+
+@dataclass(eq=False)
+class Routes:
+    """A set of trade routes, stored as parallel arrays. Each route is the purchase of a good at an origin base and
+    its sale at a destination base. Goods and bases are given as indices into the PriceMatrix that found them."""
+    good: np.ndarray
+    origin: np.ndarray
+    destination: np.ndarray
+    buyPrice: np.ndarray  # the price the good is bought for at the origin
+    sellPrice: np.ndarray  # the price the good is sold for at the destination
+    profit: np.ndarray  # the profit per unit of cargo volume
+
+    def __len__(self):
+        return len(self.good)
+
+    def ranked(self, start: int, stop: int, by: Optional[np.ndarray] = None) -> np.ndarray:
+        """Return the indices of the routes ranked `start` to `stop` (exclusive) by descending profit, or by
+        descending values of the array `by` if given. Routes of equal value are ranked by index, so that successive
+        pages of a query neither repeat nor skip routes. Only the routes valued at least as highly as the route ranked
+        `stop` are ever sorted; the rest are discarded with a partial sort (introselect) beforehand, so fetching the
+        top few ranks of a large set is cheap."""
+        stop = min(stop, len(self))
+        if start >= stop:
+            return np.arange(0)
+        key = -(self.profit if by is None else by)
+        if stop < len(self):
+            kth = key[np.argpartition(key, stop - 1)[stop - 1]]
+            best = np.flatnonzero(~(key > kth))  # every route tied with the route ranked `stop`, and any NaNs
+        else:
+            best = np.arange(len(self))
+        return best[np.lexsort((best, key[best]))][start:stop]
+
+
+class PriceMatrix:
+    """Dense goods × bases matrices of commodity prices. Element [g, b] of `sells` is the price base b sells good g
+    for, and likewise for `buys`; whether that price is meaningful is given by the masks `sold` and `bought`. This
+    allows routes to be found with array operations rather than by walking each base's market."""
+
+    def __init__(self, goods: List[fl.entities.CommodityGood], bases: List[fl.entities.BaseSolar],
+                 sells: np.ndarray, sold: np.ndarray, buys: np.ndarray, bought: np.ndarray, volumes: np.ndarray):
+        self.goods = goods
+        self.bases = bases
+        self.sells = sells
+        self.sold = sold
+        self.buys = buys
+        self.bought = bought
+        self.volumes = volumes  # the volume of one unit of each good
+
+        self.goodIndex = {g: i for i, g in enumerate(goods)}
+        self.baseIndex = {b: i for i, b in enumerate(bases)}
+
+    @classmethod
+    def fromBases(cls, bases: Iterable[fl.entities.BaseSolar]) -> 'PriceMatrix':
+        """Construct a price matrix from the markets of the given bases. Only commodities are considered."""
+        bases = [b for b in bases if b.universe_base()]
+        goods = {}
+        for base in bases:
+            universeBase = base.universe_base()
+            for good in (*universeBase.sells(), *universeBase.buys()):
+                if isinstance(good, fl.entities.CommodityGood):
+                    goods.setdefault(good, len(goods))
+
+        shape = (len(goods), len(bases))
+        sells, buys = np.zeros(shape, dtype=np.int64), np.zeros(shape, dtype=np.int64)
+        sold, bought = np.zeros(shape, dtype=bool), np.zeros(shape, dtype=bool)
+
+        for b, base in enumerate(bases):
+            universeBase = base.universe_base()
+            for prices, mask, market in ((sells, sold, universeBase.sells()), (buys, bought, universeBase.buys())):
+                for good, price in market.items():
+                    g = goods.get(good)
+                    if g is not None:
+                        prices[g, b] = price
+                        mask[g, b] = True
+
+        volumes = np.array([good.commodity().volume for good in goods], dtype=np.int64)
+        return cls(list(goods), bases, sells, sold, buys, bought, volumes)
+
+    def indicesOf(self, bases: Iterable[fl.entities.BaseSolar]) -> np.ndarray:
+        """Return the column indices of the given bases, ignoring any that are not in this matrix."""
+        return np.fromiter((self.baseIndex[b] for b in bases if b in self.baseIndex), dtype=np.intp)
+
+    def routes(self, origins: np.ndarray, destinations: np.ndarray, goods: Optional[np.ndarray] = None) -> Routes:
+        """Find every profitable route from the bases with indices `origins` to those with indices `destinations`,
+        optionally only for the goods with indices `goods`. The profit of every (good, origin, destination) triple is
+        found at once by broadcasting, then masked."""
+        # only consider goods both sold somewhere in the origin set and bought somewhere in the destination set
+        rows = np.flatnonzero(self.sold[:, origins].any(axis=1) & self.bought[:, destinations].any(axis=1))
+        if goods is not None:
+            rows = np.intersect1d(rows, goods)
+
+        originPrices = self.sells[np.ix_(rows, origins)]  # goods × origins
+        destinationPrices = self.buys[np.ix_(rows, destinations)]  # goods × destinations
+
+        profitable = (destinationPrices[:, np.newaxis, :] > originPrices[:, :, np.newaxis]) \
+            & self.sold[np.ix_(rows, origins)][:, :, np.newaxis] \
+            & self.bought[np.ix_(rows, destinations)][:, np.newaxis, :]
+
+        g, o, d = np.nonzero(profitable)
+        buyPrice, sellPrice = originPrices[g, o], destinationPrices[g, d]
+        return Routes(good=rows[g], origin=origins[o], destination=destinations[d], buyPrice=buyPrice,
+                      sellPrice=sellPrice, profit=(sellPrice - buyPrice) // np.maximum(self.volumes[rows[g]], 1))
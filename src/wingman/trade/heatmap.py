@@ -0,0 +1,110 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a matrix of the best trade between every pair of
+systems.
+"""
+from typing import List, Tuple
+import logging
+
+from flint import cached
+import flint as fl
+import numpy as np
+
+from .index import MarketIndex, getMarketIndex
+from .persistence import fingerprint, cachePath, prepareCachePath
+
+NOT_SOLD = np.iinfo(np.int64).max // 4  # the price used where a system doesn't sell a good, so it never profits
+
+
+class Heatmap:
+    """Element [a, b] of `profit` is the profit per unit of cargo volume of the best trade that can be made by buying
+    a good in system a and selling it in system b, or 0 if there is none. Docking rights are not taken into account."""
+
+    def __init__(self, systems: List[fl.entities.System], profit: np.ndarray):
+        self.systems = systems
+        self.systemIndex = {s: i for i, s in enumerate(systems)}
+        self.profit = profit
+
+    @classmethod
+    def fromIndex(cls, index: MarketIndex) -> 'Heatmap':
+        """Compute the heatmap for a market index. Prices are reduced to the extremes in each system first, so this
+        is quick enough to run in the calling thread."""
+        goodCount, systemCount = len(index.goods), len(index.systems)
+        goods, bases = np.nonzero(index.sold)
+        cheapest = np.full((goodCount, systemCount), NOT_SOLD, dtype=np.int64)
+        np.minimum.at(cheapest, (goods, index.systemOf[bases]), index.sells[goods, bases])
+        goods, bases = np.nonzero(index.bought)
+        dearest = np.zeros((goodCount, systemCount), dtype=np.int64)
+        np.maximum.at(dearest, (goods, index.systemOf[bases]), index.buys[goods, bases])
+        profit = bestTrade(cheapest, dearest, np.maximum(index.volumes, 1))
+        return cls(list(index.systems), profit.astype(np.int32))
+
+    @classmethod
+    def load(cls, path: str) -> 'Heatmap':
+        """Load a heatmap saved with `save`."""
+        with np.load(path) as archive:
+            return cls([fl.systems[n] for n in archive['systems'].tolist()], archive['profit'])
+
+    def save(self, path: str):
+        """Save this heatmap to `path`."""
+        with open(path, 'wb') as f:
+            np.savez(f, systems=np.array([s.nickname for s in self.systems]), profit=self.profit)
+
+    def fromSystem(self, origin: fl.entities.System) -> np.ndarray:
+        """The profit of the best trade from `origin` to every system, in the order of `systems`."""
+        if origin not in self.systemIndex:  # a system without markets
+            return np.zeros(len(self.systems), dtype=self.profit.dtype)
+        return self.profit[self.systemIndex[origin]]
+
+    def bestDestinations(self, origin: fl.entities.System, count: int) -> List[Tuple[fl.entities.System, int]]:
+        """The `count` systems with the most profitable trades from `origin`, with the profit of each, best first."""
+        row = self.fromSystem(origin)
+        best = np.argsort(-row, kind='stable')[:count]
+        return [(self.systems[s], int(row[s])) for s in best if row[s] > 0]
+
+
+def bestTrade(cheapest: np.ndarray, dearest: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+    """Find the best profit per unit volume between every pair of systems, given the lowest price each good is sold
+    for in each system and the highest price it is bought for."""
+    best = np.zeros((cheapest.shape[1], cheapest.shape[1]), dtype=np.int64)
+    for sold, bought, volume in zip(cheapest, dearest, volumes):
+        np.maximum(best, (bought[np.newaxis, :] - sold[:, np.newaxis]) // volume, out=best)
+    return best
+
+
+@cached
+def getHeatmap() -> Heatmap:
+    """The heatmap for the loaded game files. It is read from the cache directory if it has been computed for these
+    files before, otherwise it is computed and written there."""
+    key = fingerprint([*(path for paths in fl.paths.inis.values() for path in paths),
+                       *(s.definition_path() for s in fl.systems)])
+    try:
+        return Heatmap.load(cachePath('heatmap', key, '.npz'))
+    except (OSError, KeyError, ValueError):
+        pass
+
+    logging.info('Computing trade heatmap')
+    heatmap = Heatmap.fromIndex(getMarketIndex())
+    heatmap.save(prepareCachePath('heatmap', key, '.npz'))
+    return heatmap
+
+
+def heatmapReady() -> bool:
+    """Whether the heatmap has been loaded or computed, i.e. whether `getHeatmap` will return without blocking."""
+    return getHeatmap.cache_info().currsize > 0
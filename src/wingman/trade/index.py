@@ -0,0 +1,68 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines the market index, a universe-wide price matrix
+which is built once after markets have been loaded.
+"""
+import threading
+
+from flint import cached
+import flint as fl
+import numpy as np
+
+from .engine import PriceMatrix
+from .overrides import getPriceOverrides
+
+
+class MarketIndex(PriceMatrix):
+    """A price matrix covering every base in the universe, indexed by good, system and base."""
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.lock = threading.Lock()  # held while a query reads prices or a price is changed
+        self.systems = list({b.system(): None for b in self.bases})
+        self.systemIndex = {s: i for i, s in enumerate(self.systems)}
+        self.systemOf = np.array([self.systemIndex[b.system()] for b in self.bases], dtype=np.intp)
+        self.allBases = np.arange(len(self.bases))
+
+        # group base indices by system. A stable sort keeps each group in index order
+        order = np.argsort(self.systemOf, kind='stable')
+        bounds = np.searchsorted(self.systemOf[order], np.arange(len(self.systems) + 1))
+        self.systemBases = {s: order[bounds[i]:bounds[i + 1]] for i, s in enumerate(self.systems)}
+
+    def updatePrice(self, good: int, base: int, change: int, buy: bool):
+        """Change the price the player can buy (if `buy` is true) or sell the good with index `good` for at the base
+        with index `base` by `change` credits."""
+        prices, mask = (self.sells, self.sold) if buy else (self.buys, self.bought)
+        if not mask[good, base]:
+            return
+        with self.lock:
+            prices[good, base] += change
+
+    def basesIn(self, system: fl.entities.System) -> np.ndarray:
+        """The indices of the bases in the given system."""
+        return self.systemBases.get(system, self.allBases[:0])
+
+
+@cached
+def getMarketIndex() -> MarketIndex:
+    """The market index for the loaded game files. Being cached centrally, it is discarded along with the rest of
+    flint's data when the game files are reloaded. The user's price corrections are applied."""
+    index = MarketIndex.fromBases(b for s in fl.systems for b in s.bases())
+    getPriceOverrides().applyTo(index)
+    return index
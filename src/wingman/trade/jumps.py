@@ -0,0 +1,114 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a table of the shortest routes between every pair
+of systems.
+"""
+from typing import Dict, List
+from collections import deque
+import logging
+
+from flint import cached
+import flint as fl
+import numpy as np
+
+from .persistence import fingerprint, cachePath, prepareCachePath
+
+UNREACHABLE = -1
+
+
+class JumpTable:
+    """All-pairs shortest routes through the universe graph. Element [a, b] of `hops` is the number of jumps needed to
+    travel from system a to system b, and element [a, b] of `nextHop` is the first system on that route. A route is
+    therefore reconstructed in time proportional to its length."""
+
+    def __init__(self, systems: List[fl.entities.System], hops: np.ndarray, nextHop: np.ndarray):
+        self.systems = systems
+        self.systemIndex = {s: i for i, s in enumerate(systems)}
+        self.hops = hops
+        self.nextHop = nextHop
+
+    @classmethod
+    def fromGraph(cls, graph: Dict[fl.entities.System, Dict[fl.entities.System, int]]) -> 'JumpTable':
+        """Construct a jump table by breadth-first search from every system in `graph`. Edge weights are ignored;
+        flint only uses a placeholder weight for every connection."""
+        systems = list(graph)
+        systemIndex = {s: i for i, s in enumerate(systems)}
+        neighbours = [[systemIndex[n] for n in graph[s] if n in systemIndex] for s in systems]
+
+        hops = np.full((len(systems), len(systems)), UNREACHABLE, dtype=np.int16)
+        nextHop = np.full_like(hops, UNREACHABLE)
+
+        for source in range(len(systems)):
+            sourceHops, sourceNext = hops[source], nextHop[source]
+            sourceHops[source] = 0
+            sourceNext[source] = source
+            queue = deque([source])
+            while queue:
+                current = queue.popleft()
+                for neighbour in neighbours[current]:
+                    if sourceHops[neighbour] == UNREACHABLE:
+                        sourceHops[neighbour] = sourceHops[current] + 1
+                        sourceNext[neighbour] = neighbour if current == source else sourceNext[current]
+                        queue.append(neighbour)
+
+        return cls(systems, hops, nextHop)
+
+    @classmethod
+    def load(cls, path: str) -> 'JumpTable':
+        """Load a jump table saved with `save`."""
+        with np.load(path) as archive:
+            systems = [fl.systems[n] for n in archive['systems'].tolist()]
+            return cls(systems, archive['hops'], archive['nextHop'])
+
+    def save(self, path: str):
+        """Save this jump table to `path`."""
+        with open(path, 'wb') as f:
+            np.savez(f, systems=np.array([s.nickname for s in self.systems]), hops=self.hops, nextHop=self.nextHop)
+
+    def distance(self, origin: fl.entities.System, destination: fl.entities.System) -> int:
+        """The number of jumps between two systems, or UNREACHABLE if there is no route between them."""
+        return int(self.hops[self.systemIndex[origin], self.systemIndex[destination]])
+
+    def route(self, origin: fl.entities.System, destination: fl.entities.System) -> List[fl.entities.System]:
+        """The shortest route between two systems, including both, or an empty list if there is no route. This is
+        equivalent to `flint.maps.inter_system_route`."""
+        current, end = self.systemIndex[origin], self.systemIndex[destination]
+        if self.hops[current, end] == UNREACHABLE:
+            return []
+        route = [current]
+        while current != end:
+            current = int(self.nextHop[current, end])
+            route.append(current)
+        return [self.systems[s] for s in route]
+
+
+@cached
+def getJumpTable() -> JumpTable:
+    """The jump table for the loaded game files. It is read from the cache directory if it has been computed for
+    these files before, otherwise it is computed and written there."""
+    key = fingerprint([*fl.paths.inis['universe'], *(s.definition_path() for s in fl.systems)])
+    try:
+        return JumpTable.load(cachePath('jumps', key, '.npz'))
+    except (OSError, KeyError, ValueError):
+        pass
+
+    logging.info('Computing jump table')
+    table = JumpTable.fromGraph(fl.maps.generate_universe_graph())
+    table.save(prepareCachePath('jumps', key, '.npz'))
+    return table
@@ -0,0 +1,193 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a search for multi-leg circular trade routes
+("loops"), run in a pool of worker processes.
+"""
+from typing import Iterable, List, Optional, Set, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+import heapq
+import multiprocessing
+import threading
+
+from dataclassy import dataclass
+import flint as fl
+import numpy as np
+
+from .index import MarketIndex, getMarketIndex
+from .travel import TravelTimes, getTravelTimes
+from .jumps import UNREACHABLE
+
+
+@dataclass
+class Loop:
+    """A circular trade route. The loop starts at the first base, visits each subsequent base in turn and returns to
+    the first. The good carried on each leg is given by `goods`. Bases and goods are indices into the market index."""
+    profit: int  # total profit per unit of cargo volume
+    bases: List[int]
+    goods: List[int]
+
+    def cycle(self) -> Tuple[int, ...]:
+        """The bases of this loop rotated to start at the lowest index. This identifies the loop whichever of its bases
+        it starts at."""
+        first = self.bases.index(min(self.bases))
+        return tuple(self.bases[first:] + self.bases[:first])
+
+
+class LoopFinder:
+    """Searches for loops. For every pair of bases that trade, the most profitable good to carry between them and the
+    jump count between them are precomputed; the search itself is a depth-first search over these leg matrices,
+    pruned by an upper bound on the profit still obtainable and by a limit on the jumps per leg."""
+
+    def __init__(self, index: MarketIndex, travel: TravelTimes):
+        self.bases = np.flatnonzero(index.sold.any(axis=0) | index.bought.any(axis=0))
+        self.position = np.full(len(index.bases), UNREACHABLE, dtype=np.intp)  # index base -> leg matrix position
+        self.position[self.bases] = np.arange(len(self.bases))
+
+        self.profit = np.zeros((len(self.bases), len(self.bases)), dtype=np.int32)
+        self.good = np.full(self.profit.shape, UNREACHABLE, dtype=np.int32)
+        for g in range(len(index.goods)):
+            sellers = self.position[np.flatnonzero(index.sold[g])]
+            buyers = self.position[np.flatnonzero(index.bought[g])]
+            if not len(sellers) or not len(buyers):
+                continue
+            legProfit = (index.buys[g, self.bases[buyers]][np.newaxis, :]
+                         - index.sells[g, self.bases[sellers]][:, np.newaxis]) // max(index.volumes[g], 1)
+            cells = np.ix_(sellers, buyers)
+            better = legProfit > self.profit[cells]
+            self.profit[cells] = np.where(better, legProfit, self.profit[cells])
+            self.good[cells] = np.where(better, g, self.good[cells])
+
+        systems = travel.baseSystem[self.bases]
+        self.hops = travel.jumps.hops[np.ix_(systems, systems)]
+        self.hops[(systems == UNREACHABLE)[:, np.newaxis] | (systems == UNREACHABLE)[np.newaxis, :]] = UNREACHABLE
+
+        self.executor: Optional[ProcessPoolExecutor] = None
+
+    def search(self, starts: np.ndarray, legs: int, maxJumps: int, allowed: np.ndarray,
+               limit: int = 50) -> List[Future]:
+        """Begin searching for the `limit` most profitable loops of `legs` legs from each of the bases with indices
+        `starts`, with no leg longer than `maxJumps` jumps and visiting only bases where `allowed` (a mask over the
+        market index's bases) is true. Return a future for each starting base, resolving to a list of Loops."""
+        if self.executor is None:  # spawn rather than fork, as the caller's process is multithreaded
+            self.executor = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'),
+                                                initializer=initialiseWorker,
+                                                initargs=(self.bases, self.profit, self.good, self.hops))
+        allowed = allowed[self.bases]
+        return [self.executor.submit(searchFrom, int(self.position[s]), legs, maxJumps, allowed, limit)
+                for s in starts if self.position[s] != UNREACHABLE and allowed[self.position[s]]]
+
+    def shutdown(self):
+        """Stop this finder's worker processes. Searches not yet started are cancelled."""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+
+# state of a worker process, set by initialiseWorker
+workerMatrices = ()
+
+
+def initialiseWorker(*matrices: np.ndarray):
+    """Initialise a worker process with a LoopFinder's matrices, so that they are only transferred once."""
+    global workerMatrices
+    workerMatrices = matrices
+
+
+def searchFrom(start: int, legs: int, maxJumps: int, allowed: np.ndarray, limit: int,
+               branching: int = 16) -> List[Loop]:
+    """Find the most profitable loops from the base at leg matrix position `start`. This runs in a worker process.
+    At each step only the `branching` most profitable legs onwards are explored."""
+    bases, profit, good, hops = workerMatrices
+    reachable = (hops >= 0) & (hops <= maxJumps) & (profit > 0) & allowed[np.newaxis, :]
+    bestLeg = int(profit[reachable].max(initial=0))
+    candidates = {}
+    found = []  # a min-heap of (profit, path), holding the best loops found so far
+
+    def onwards(current: int) -> List[int]:
+        """The most profitable positions reachable from `current`, best first."""
+        if current not in candidates:
+            options = np.flatnonzero(reachable[current])
+            if len(options) > branching:
+                options = options[np.argpartition(-profit[current, options], branching - 1)[:branching]]
+            candidates[current] = options[np.argsort(-profit[current, options])].tolist()
+        return candidates[current]
+
+    def visit(path: List[int], total: int):
+        current = path[-1]
+        if len(path) == legs:  # close the loop
+            if reachable[current, start]:
+                entry = (total + int(profit[current, start]), path)
+                if len(found) < limit:
+                    heapq.heappush(found, entry)
+                else:
+                    heapq.heappushpop(found, entry)
+            return
+        for following in onwards(current):
+            if following in path:
+                continue
+            subtotal = total + int(profit[current, following])
+            if len(found) == limit and subtotal + (legs - len(path)) * bestLeg <= found[0][0]:
+                break  # candidates are in descending order of profit, so no later one can do better
+            visit(path + [following], subtotal)
+
+    visit([start], 0)
+    return [Loop(total, bases[path].tolist(), [int(good[a, b]) for a, b in zip(path, path[1:] + path[:1])])
+            for total, path in sorted(found, reverse=True)]
+
+
+def mergeLoops(loops: Iterable[Loop], seen: Set[Tuple[int, ...]]) -> List[Loop]:
+    """Merge the results of `searchFrom` for one starting base into those already received, whose cycles are `seen`.
+    Return the loops not already received, and add their cycles to `seen`. A loop through several of the bases
+    searched from is found from each of them, starting at a different base each time."""
+    result = []
+    for loop in loops:
+        cycle = loop.cycle()
+        if cycle not in seen:
+            seen.add(cycle)
+            result.append(loop)
+    return result
+
+
+class LoopFinderCache:
+    """Holds the loop finder for the loaded game files, creating it when first called. Unlike functools.lru_cache,
+    clearing it (as reloading the game files or correcting a price does) also stops the discarded finder's worker
+    processes."""
+
+    def __init__(self):
+        self.finder: Optional[LoopFinder] = None
+        self.lock = threading.Lock()
+
+    def __call__(self) -> LoopFinder:
+        with self.lock:
+            if self.finder is None:
+                self.finder = LoopFinder(getMarketIndex(), getTravelTimes())
+            return self.finder
+
+    def cache_clear(self):
+        """Discard the loop finder, stopping its worker processes."""
+        with self.lock:
+            finder, self.finder = self.finder, None
+        if finder is not None:
+            finder.shutdown()
+
+
+getLoopFinder = LoopFinderCache()  # the loop finder for the loaded game files
+
+# the finder is only valid for the loaded game files, so clear it along with flint's caches
+fl.central_cache.add(getLoopFinder)
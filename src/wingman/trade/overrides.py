@@ -0,0 +1,101 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines corrections to the prices in the game files,
+entered by the user from prices observed in game.
+"""
+from typing import Dict, TYPE_CHECKING
+import json
+import logging
+import os
+
+from flint import cached
+import flint as fl
+
+from .. import OVERRIDES_FILE
+
+if TYPE_CHECKING:
+    from .index import MarketIndex  # not imported at runtime, as the market index applies overrides when built
+
+
+class PriceOverrides:
+    """Price corrections, stored as the difference in credits between the observed price of a good at a base and
+    the price given by the game files. The price a base sells a good for (the player's buy price) and the price it
+    buys it for are corrected separately. Corrections are saved to a JSON file of the form
+    {'buy': {base: {good: delta}}, 'sell': {...}}, keyed by nickname."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.deltas: Dict[str, Dict[str, Dict[str, int]]] = {'buy': {}, 'sell': {}}
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            self.deltas = {side: saved.get(side, {}) for side in self.deltas}
+        except FileNotFoundError:
+            pass
+        except (ValueError, AttributeError):
+            logging.warning('Price overrides corrupt, ignoring')
+
+    def delta(self, base: fl.entities.BaseSolar, good: fl.entities.CommodityGood, buy: bool) -> int:
+        """The correction to the price the player can buy (if `buy` is true) or sell `good` for at `base`."""
+        return self.deltas[side(buy)].get(base.nickname, {}).get(good.nickname, 0)
+
+    def setDelta(self, base: fl.entities.BaseSolar, good: fl.entities.CommodityGood, buy: bool, delta: int):
+        """Set the correction to the price the player can buy (if `buy` is true) or sell `good` for at `base`, and
+        save all corrections."""
+        bases = self.deltas[side(buy)]
+        goods = bases.setdefault(base.nickname, {})
+        if delta:
+            goods[good.nickname] = delta
+        else:
+            goods.pop(good.nickname, None)
+            if not goods:
+                del bases[base.nickname]
+        self.save()
+
+    def applyTo(self, index: 'MarketIndex'):
+        """Apply every correction to a freshly built market index. Corrections for bases or goods which are no
+        longer in the game files are ignored, but kept."""
+        if not any(self.deltas.values()):
+            return
+        baseIndex = {b.nickname: i for i, b in enumerate(index.bases)}
+        goodIndex = {g.nickname: i for i, g in enumerate(index.goods)}
+        for buy in (True, False):
+            for base, goods in self.deltas[side(buy)].items():
+                for good, delta in goods.items():
+                    if base in baseIndex and good in goodIndex:
+                        index.updatePrice(goodIndex[good], baseIndex[base], delta, buy)
+
+    def save(self):
+        """Save corrections to disk."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(self.deltas, f, indent=1, sort_keys=True)
+
+
+def side(buy: bool) -> str:
+    """The key of the corrections to buy or sell prices."""
+    return 'buy' if buy else 'sell'
+
+
+@cached
+def getPriceOverrides() -> PriceOverrides:
+    """The user's price corrections."""
+    return PriceOverrides(OVERRIDES_FILE)
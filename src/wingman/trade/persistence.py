@@ -0,0 +1,61 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file contains utilities for persisting derived data to the
+app data directory, keyed by the game files it was derived from.
+"""
+from typing import Iterable
+import glob
+import hashlib
+import os
+
+from .. import CACHE_DIR
+
+
+def fingerprint(paths: Iterable[str]) -> str:
+    """Return a short hash identifying the current state of the files at `paths`. Each file's size and modification
+    time are hashed, as are the contents of INI files, since tools that patch them often keep their size and
+    modification time. Other files (models, textures, sounds) are too large to hash at every start."""
+    digest = hashlib.sha1()
+    for path in sorted(set(paths)):
+        try:
+            stat = os.stat(path)
+            digest.update(f'{path}\0{stat.st_size}\0{stat.st_mtime_ns}\0'.encode())
+            if path.lower().endswith('.ini'):
+                with open(path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        digest.update(chunk)
+        except OSError:
+            digest.update(f'{path}\0missing\0'.encode())
+    return digest.hexdigest()[:16]
+
+
+def cachePath(name: str, key: str, extension: str) -> str:
+    """The path, relative to the app data directory, of the cache file for `name` derived from files with the
+    fingerprint `key`."""
+    return os.path.join(CACHE_DIR, f'{name}-{key}{extension}')
+
+
+def prepareCachePath(name: str, key: str, extension: str) -> str:
+    """Like `cachePath`, but also create the cache directory and remove stale cache files for `name`."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = cachePath(name, key, extension)
+    for stale in glob.glob(cachePath(name, '*', extension)):
+        if stale != path:
+            os.remove(stale)
+    return path
@@ -0,0 +1,171 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines the route queries made by Merchant, and a cache
+of their results.
+"""
+from typing import Optional, Tuple
+from collections import OrderedDict, namedtuple
+import threading
+
+import flint as fl
+import numpy as np
+
+from .engine import Routes
+from .index import MarketIndex, getMarketIndex
+from .docking import DockingMatrix, getDockingMatrix
+from .overrides import getPriceOverrides
+from .loops import getLoopFinder
+
+ROUTE_CACHE_SIZE = 64  # the number of query results to keep
+
+Query = Tuple[fl.entities.System, Optional[fl.entities.System], Optional[fl.entities.Faction]]
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])  # as returned by functools.lru_cache
+
+
+def queryBases(index: MarketIndex, docking: Optional[DockingMatrix], origin: fl.entities.System,
+               destination: Optional[fl.entities.System] = None,
+               iff: Optional[fl.entities.Faction] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """The indices of the origin and destination bases searched by a query; see `findRoutes`."""
+    origins = index.basesIn(origin)
+    destinations = index.basesIn(destination) if destination else index.allBases
+
+    if iff:
+        dockable = docking.mask(iff)
+        origins, destinations = origins[dockable[origins]], destinations[dockable[destinations]]
+    return origins, destinations
+
+
+def findRoutes(index: MarketIndex, docking: Optional[DockingMatrix], origin: fl.entities.System,
+               destination: Optional[fl.entities.System] = None, iff: Optional[fl.entities.Faction] = None) -> Routes:
+    """Calculate the routes for every commodity bought in system `origin` and sold in system `destination` in the
+    given market index. The latter is optional; if it is not provided, routes to any base are returned. The optional
+    `iff` parameter restricts the bases searched to those dockable by that faction according to `docking`."""
+    return index.routes(*queryBases(index, docking, origin, destination, iff))
+
+
+class RouteCache:
+    """A cache of the most recently used query results for the loaded game files. Unlike functools.lru_cache, its
+    entries can be patched when a price changes (see `patch`) rather than only discarded. It is safe to use from
+    multiple threads."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.entries: 'OrderedDict[Query, Routes]' = OrderedDict()
+        self.hits = self.misses = 0
+        self.version = 0  # incremented by each patch and clear, so that results calculated meanwhile aren't cached
+        self.lock = threading.Lock()
+
+    def get(self, query: Query) -> Routes:
+        """Return the result of a query, calculating it if it is not cached."""
+        with self.lock:
+            if query in self.entries:
+                self.hits += 1
+                self.entries.move_to_end(query)
+                return self.entries[query]
+            self.misses += 1
+
+        origin, destination, iff = query
+        while True:
+            with self.lock:
+                version = self.version
+            index = getMarketIndex()  # looked up each time, as the game files may have been reloaded
+            docking = getDockingMatrix() if iff else None
+            with index.lock:  # prices are not changed mid-query
+                routes = findRoutes(index, docking, origin, destination, iff)
+            with self.lock:
+                if self.version == version:  # otherwise prices changed after the query started; calculate again
+                    self.entries[query] = routes
+                    if len(self.entries) > self.maxsize:
+                        self.entries.popitem(last=False)
+                    return routes
+
+    def patch(self, good: int, base: int):
+        """Update cached results after the price of the good with index `good` has changed at the base with index
+        `base`. Only the routes for that good in results involving that base are recalculated. Results are replaced,
+        not modified, since Routes may still be held elsewhere."""
+        index = getMarketIndex()
+        with self.lock:
+            self.version += 1  # results not yet cached may predate the change
+            entries = list(self.entries.items())
+
+        for query, routes in entries:
+            origin, destination, iff = query
+            origins, destinations = queryBases(index, getDockingMatrix() if iff else None, *query)
+            if base not in origins and base not in destinations:
+                continue
+            kept = routes.good != good
+            with index.lock:
+                fresh = index.routes(origins, destinations, goods=np.array([good]))
+            patched = Routes(*(np.concatenate([getattr(routes, f)[kept], getattr(fresh, f)])
+                               for f in ('good', 'origin', 'destination', 'buyPrice', 'sellPrice', 'profit')))
+            with self.lock:
+                if query in self.entries:
+                    self.entries[query] = patched
+
+    def cache_info(self) -> CacheInfo:
+        """Statistics about the cache, as functools.lru_cache gives."""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self.entries))
+
+    def cache_clear(self):
+        """Empty the cache and reset its statistics. Queries already running calculate their results again."""
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+            self.hits = self.misses = 0
+
+
+routeCache = RouteCache(ROUTE_CACHE_SIZE)
+
+# results are only valid for the loaded game files, so clear them along with flint's caches
+fl.central_cache.add(routeCache)
+
+
+def routesBetween(origin: fl.entities.System, destination: Optional[fl.entities.System] = None,
+                  iff: Optional[fl.entities.Faction] = None) -> Routes:
+    """`findRoutes` for the loaded game files. The most recently used results are cached, so the Routes returned
+    must not be modified."""
+    return routeCache.get((origin, destination, iff))
+
+
+def routeCacheStatistics() -> str:
+    """A summary of the route cache's effectiveness, suitable for logging."""
+    info = routeCache.cache_info()
+    lookups = info.hits + info.misses
+    return (f'Route cache: {info.hits} hits, {info.misses} misses ({info.hits / max(lookups, 1):.0%} hit rate), '
+            f'{info.currsize}/{info.maxsize} entries')
+
+
+def correctPrice(base: fl.entities.BaseSolar, good: fl.entities.CommodityGood, observed: int, buy: bool):
+    """Record that the player was observed to be able to buy (if `buy` is true) or sell `good` at `base` for
+    `observed` credits. The market index and cached results are patched in place rather than recalculated. The loop
+    finder, which precomputes the best good for every leg, is discarded. The heatmap is not updated until the game
+    files are next reloaded."""
+    index = getMarketIndex()
+    b, g = index.baseIndex[base], index.goodIndex[good]
+    if not (index.sold if buy else index.bought)[g, b]:
+        return
+    current = int((index.sells if buy else index.buys)[g, b])
+    if observed == current:
+        return
+
+    overrides = getPriceOverrides()
+    overrides.setDelta(base, good, buy, overrides.delta(base, good, buy) + observed - current)
+    index.updatePrice(g, b, observed - current, buy)
+    routeCache.patch(g, b)
+    getLoopFinder.cache_clear()
@@ -0,0 +1,104 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines estimation of travel times between bases.
+"""
+from flint import cached
+import flint as fl
+import numpy as np
+
+from .index import MarketIndex, getMarketIndex
+from .jumps import JumpTable, getJumpTable, UNREACHABLE
+
+
+class TravelTimes:
+    """Estimates the time taken to fly between any two bases. A route's length is the distance from the origin base
+    to the gate leading out of its system, plus the distance between the entry and exit gates of every system passed
+    through, plus the distance from the last gate to the destination base. Trade lanes are not taken into account, so
+    estimates are pessimistic, but they are consistent enough to rank routes by."""
+    JUMP_TIME = 20  # seconds spent jumping and being launched from a gate
+    DOCK_TIME = 30  # seconds spent docking, trading and undocking
+
+    def __init__(self, index: MarketIndex, jumps: JumpTable):
+        self.jumps = jumps
+        systemCount = len(jumps.systems)
+
+        # map each base to the jump table's index of its system, and record its position
+        systemOf = np.array([jumps.systemIndex.get(s, UNREACHABLE) for s in index.systems], dtype=np.intp)
+        self.baseSystem = systemOf[index.systemOf]
+        self.basePosition = np.array([b.pos for b in index.bases], dtype=np.float64).reshape(-1, 3)
+
+        # gates are stored sparsely, sorted by the key (system index * system count + destination system index)
+        gates = {}
+        for s, system in enumerate(jumps.systems):
+            for jump, destination in system.connections().items():
+                if destination in jumps.systemIndex:
+                    gates.setdefault(s * systemCount + jumps.systemIndex[destination], jump.pos)
+        self.gateKeys = np.array(sorted(gates), dtype=np.int64)
+        self.gatePositions = np.array([gates[k] for k in self.gateKeys], dtype=np.float64).reshape(-1, 3)
+
+        # the system before the last on each route, and the distance covered in the systems passed through
+        hops, nextHop = jumps.hops, jumps.nextHop.astype(np.intp)
+        self.previous = np.where(hops == 1, np.arange(systemCount)[:, np.newaxis], UNREACHABLE)
+        self.transit = np.zeros(hops.shape, dtype=np.float32)
+        for distance in range(2, hops.max(initial=0) + 1):
+            origins, destinations = np.nonzero(hops == distance)
+            via = nextHop[origins, destinations]
+            following = nextHop[via, destinations]
+            self.previous[origins, destinations] = self.previous[via, destinations]
+            self.transit[origins, destinations] = self.transit[via, destinations] + np.linalg.norm(
+                self.gate(via, origins) - self.gate(via, following), axis=1)
+
+    def gate(self, systems: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+        """The positions of the gates (or holes) in each of `systems` which lead to each of `destinations`, or NaN
+        where there is no such gate."""
+        keys = systems.astype(np.int64) * len(self.jumps.systems) + destinations
+        found = np.searchsorted(self.gateKeys, keys)
+        matched = found < len(self.gateKeys)
+        matched[matched] = self.gateKeys[found[matched]] == keys[matched]
+        positions = np.full((len(keys), 3), np.nan)
+        positions[matched] = self.gatePositions[found[matched]]
+        return positions
+
+    def estimate(self, origins: np.ndarray, destinations: np.ndarray,
+                 cruiseSpeed: float = fl.maps.DEFAULT_CRUISE_SPEED) -> np.ndarray:
+        """Estimate the time, in seconds, to fly from each base in `origins` to the corresponding base in
+        `destinations` at `cruiseSpeed`. Where no route exists, the estimate is infinite."""
+        originSystems, destinationSystems = self.baseSystem[origins], self.baseSystem[destinations]
+        originPositions, destinationPositions = self.basePosition[origins], self.basePosition[destinations]
+        hops = self.jumps.hops[originSystems, destinationSystems].astype(np.float64)
+
+        exits = self.gate(originSystems, self.jumps.nextHop[originSystems, destinationSystems])
+        entries = self.gate(destinationSystems, self.previous[originSystems, destinationSystems])
+        distance = np.where(
+            hops == 0,
+            np.linalg.norm(destinationPositions - originPositions, axis=1),
+            np.linalg.norm(exits - originPositions, axis=1) + self.transit[originSystems, destinationSystems]
+            + np.linalg.norm(destinationPositions - entries, axis=1)
+        )
+
+        times = distance / cruiseSpeed + hops * self.JUMP_TIME + self.DOCK_TIME
+        times[(hops == UNREACHABLE) | (originSystems == UNREACHABLE) | (destinationSystems == UNREACHABLE)
+              | np.isnan(times)] = np.inf  # NaN where a gate on the route is missing
+        return times
+
+
+@cached
+def getTravelTimes() -> TravelTimes:
+    """Travel time estimates for the loaded game files."""
+    return TravelTimes(getMarketIndex(), getJumpTable())
@@ -113,7 +113,7 @@ class Wingman {
         // Right now this is only used to show the current navmap system in the universe map.
         // In the future it will be used to display the start and destination for route planning.
 
-        $('.system').children().css({  // todo: hacky workaround for weird need to reset
+        $('.system').removeAttr('title').children().css({  // todo: hacky workaround for weird need to reset
             'color': 'white',
             'font-weight': 'normal',
         });
@@ -124,6 +124,16 @@ class Wingman {
         });
     }
 
+    showHeat(heat) {
+        // Colour systems on the universe map from cool (blue) to hot (red). `heat` maps system nicknames to a pair
+        // of a value between 0 and 1 and a tooltip. Systems not in `heat` are unchanged.
+        for (const [systemNickname, [value, tooltip]] of Object.entries(heat)) {
+            $(`[data-system-nickname='${systemNickname}']`).attr('title', tooltip).children().css({
+                'color': `hsl(${Math.round(240 * (1 - value))}, 100%, 60%)`,
+            });
+        }
+    }
+
     drawShip(x, y, z) {
         // Remove any existing ship markers and draw a new one at the given coordinates.
         $(".playerShip").remove();
@@ -79,10 +79,22 @@ class SimpleTable(QtWidgets.QTableView):
 
     def horizontalHeaderLabels(self) -> List[str]:
         """Return the model's horizontal header labels (see setHorizontalHeaderLabels)"""
-        return [self.itemModel.headerData(i, QtCore.Qt.Horizontal) for i in range(self.itemModel.columnCount())]
+        model = self.sourceModel()
+        return [model.headerData(i, QtCore.Qt.Horizontal) for i in range(model.columnCount())]
+
+    def sourceModel(self) -> QtCore.QAbstractItemModel:
+        """Return the model currently displayed by the table."""
+        return self.filterModel.sourceModel()
+
+    def setSourceModel(self, model: QtCore.QAbstractItemModel):
+        """Display a model other than the table's own item model, for example one that holds its data in arrays.
+        Filtering still applies. The item model is displayed again when the table is next populated."""
+        if model is not self.sourceModel():
+            self.filterModel.setSourceModel(model)
 
     def clear(self):
         """Clear the table, without clearing the headings."""
+        self.setSourceModel(self.itemModel)
         self.itemModel.removeRows(0, self.itemModel.rowCount())
 
     def populate(self, rows: List[List[QtGui.QStandardItem]]):
@@ -157,18 +169,19 @@ class SimpleTable(QtWidgets.QTableView):
     def modelToTSV(self, row: Optional[int] = None):
         """Represent the item model as a TSV dump of its data. If row is specified, it is the index to the singular row
         in the model to be exported. Otherwise, all rows will be exported."""
-        columns = range(self.itemModel.columnCount())
-        rows = range(self.itemModel.rowCount())
+        model = self.sourceModel()
+        columns = range(model.columnCount())
+        rows = range(model.rowCount())
         result = []
         if row is not None:
             for column in columns:
-                result.append(str(self.itemModel.index(row, column).data()))
+                result.append(str(model.index(row, column).data()))
             return '\t'.join(result)
         else:
             for row in rows:
                 tmp = []
                 for column in columns:
-                    tmp.append(str(self.itemModel.index(row, column).data()))
+                    tmp.append(str(model.index(row, column).data()))
                 result.append('\t'.join(tmp))
             return os.linesep.join(result)
 
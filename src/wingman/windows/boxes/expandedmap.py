@@ -16,7 +16,9 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 """
+from typing import Dict, Optional, Tuple
 from functools import partial
+import json
 
 from PyQt5 import QtCore, QtWidgets
 import flint as fl
@@ -61,14 +63,17 @@ class ExpandedMap(MapView):
         self.displayChanged.connect(lambda: self.setWindowTitle(self.getDisplayed().title()))
         self.display()
 
-    def displayUniverse(self, highlightedSystem=None):
-        """Display an expanded universe map."""
+    def displayUniverse(self, highlightedSystem=None, heat: Optional[Dict[str, Tuple[float, str]]] = None):
+        """Display an expanded universe map. If `heat` is given, systems are coloured by it; see
+        `wingman.showHeat` in navmap.js."""
         super().displayUniverse()
         self.setWindowModality(QtCore.Qt.ApplicationModal)
         self.setWindowTitle('Sirius')
         self.display()
 
         self.page().runJavaScript(f'wingman.highlightSystem({highlightedSystem!r})')
+        if heat:
+            self.page().runJavaScript(f'wingman.showHeat({json.dumps(heat)})')
         self.disconnectDisplayChanged()
         self.displayChanged.connect(self.hide)
 
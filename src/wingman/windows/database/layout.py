@@ -23,6 +23,7 @@ from .pages import *
 from ... import app
 from ...widgets.infocardview import InfocardView
 from ...widgets.scrollablelist import ScrollableList
+from ..main.loading import gameData
 
 
 class Database(QtWidgets.QDialog):
@@ -49,11 +50,13 @@ class Database(QtWidgets.QDialog):
 
         self.infocardView = InfocardView(self)
         self.currentPage = None
+        self.currentName = None
         self.mainSplitter = QtWidgets.QSplitter()
         self.mainSplitter.addWidget(self.infocardView)
         self.mainLayout.addWidget(self.mainSplitter)
 
         self.displayPage('Bases')
+        gameData.changed.connect(self.onGameDataChanged)
         self.show()
 
     def displayPage(self, name: str):
@@ -77,8 +80,19 @@ class Database(QtWidgets.QDialog):
             self.mainSplitter.setCollapsible(0, False)
 
         self.currentPage = newPage
+        self.currentName = name
         self.currentPage.show()
 
+    def onGameDataChanged(self):
+        """Discard every page, as each is populated from game data, and repopulate the displayed page."""
+        for page in self.pagesCache.values():
+            if page is not self.currentPage:
+                page.deleteLater()
+        self.pagesCache.clear()
+        oldPage = self.currentPage
+        self.displayPage(self.currentName)
+        oldPage.deleteLater()
+
 
 HEADINGS = {
     'Bases': BasesPage,
@@ -24,6 +24,7 @@ from PyQt5 import QtWidgets
 
 from ...widgets.simpletable import SimpleTable
 from ...models.items import *
+from ...models.labels import baseLabel, getBaseSolars
 
 
 class DatabasePage(QtWidgets.QSplitter):
@@ -82,20 +83,24 @@ class BasesPage(DatabasePage):
         super().__init__(parent, secondaryWidget=self.marketBox)
 
     def populate(self):
-        self.mainTable.populate([
-            [
+        rows, solars = [], getBaseSolars()
+        for base in fl.bases:
+            solar = solars.get(base.nickname)
+            if solar is None:
+                continue
+            label = baseLabel(solar)
+            rows.append([
                 BaseItem(base),
-                GenericItem(base.solar().owner().name()),
-                GenericItem(base.system_().name()),
-                GenericItem(base.sector()),
-                GenericItem(base.system_().region()),
+                GenericItem(label.owner),
+                GenericItem(label.system),
+                GenericItem(label.sector),
+                GenericItem(label.region),
                 MonospaceItem(base.nickname),
-                MonospaceItem(base.system_().nickname),
+                MonospaceItem(base.system),
                 GenericItem(base.ids_name),
-                GenericItem(base.solar().ids_info),
-            ]
-            for base in fl.bases if base.has_solar()]
-        )
+                GenericItem(solar.ids_info),
+            ])
+        self.mainTable.populate(rows)
 
     def onSelectedRowChanged(self, selectedItems):
         base = super().onSelectedRowChanged(selectedItems)
@@ -167,7 +172,7 @@ class CommoditiesPage(DatabasePage):
                 BooleanItem(base in sold),
                 MonospaceItem(base.nickname),
             ]
-            for base, price in {**bought, **sold}.items() if base.has_solar()
+            for base, price in {**bought, **sold}.items() if base.nickname in getBaseSolars()
         ])
         self.economyTable.sortByColumn(3, QtCore.Qt.DescendingOrder)  # sort by "sells" column
 
@@ -207,7 +212,7 @@ class EquipmentPage(DatabasePage):
                 SystemItem(base.system_()),
                 FactionItem(base.owner()),
                 MonospaceItem(base.nickname),
-            ] for base in equipment.sold_at() if base.has_solar()
+            ] for base in equipment.sold_at() if base.nickname in getBaseSolars()
         ])
 
 
@@ -519,7 +524,7 @@ class ShipsPage(DatabasePage):
                 SystemItem(base.system_()),
                 FactionItem(base.owner()),
                 MonospaceItem(base.nickname),
-            ] for base in ship.sold_at() if base.has_solar()
+            ] for base in ship.sold_at() if base.nickname in getBaseSolars()
         ])
 
         # organise hardpoints by category
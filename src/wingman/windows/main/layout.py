@@ -18,26 +18,32 @@ along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 
 This file defines the interface of the application's main window.
 """
-from typing import Callable, Union, Type
+from typing import Callable, Union, Type, TYPE_CHECKING
 import logging
+import time
 
-from PyQt5 import QtWidgets, QtGui
+from PyQt5 import QtCore, QtWidgets, QtGui
 from flint import cached
 
-from ... import config, __app__
+from ... import config, __app__, STARTED
+from ...tracing import tracer
 from . import merchant, navmap, roster, banner, menus, loading
+from .preloading import Preloader
 from .navmap.navmap import Navmap
 from .merchant.merchant import Merchant
 from .roster.roster import Roster
-from ...windows.boxes.expandedmap import ExpandedMap
 from ...windows.database.layout import Database
 
+if TYPE_CHECKING:
+    from ...windows.boxes.expandedmap import ExpandedMap  # imported when first created, as it loads QtWebEngine
+
 
 class MainWindow(QtWidgets.QMainWindow):
     """The application's main window."""
     title = __app__
     initialDimensions = (1060, 610)
 
+    @tracer.traced('MainWindow.__init__')
     def __init__(self):
         logging.info('Loading main window')
         super().__init__()
@@ -56,7 +62,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tw.setContentsMargins(0, 0, 0, 0)
 
         self.tabMap = self.addTab(navmap.layout.NavmapTab(self.tw), self.navmap)
-        self.tabMer = self.addTab(merchant.layout.MerchantTab(self.tw), self.merchant)
+        # Merchant needs every market, so is only loaded and enabled once they are (see loading.GameData.whenReady)
+        self.tabMer = self.addTab(merchant.layout.MerchantTab(self.tw),
+                                  lambda: loading.gameData.whenReady('markets', self.merchant))
+        self.tabMer.setEnabled(False)
+        loading.gameData.whenReady('markets', lambda: self.tabMer.setEnabled(True))
         self.tabRoster = self.addTab(roster.layout.RosterTab(self.tw), self.roster)
         self.dbShortcut = self.addPseudoTab(Database)
 
@@ -69,24 +79,36 @@ class MainWindow(QtWidgets.QMainWindow):
         # Menu bar
 
         menuBar = self.menuBar()
-        menuBar.addMenu(menus.Utilities(menuBar))
-        menuBar.addMenu(menus.File(menuBar))
-        menuBar.addMenu(menus.Freelancer(menuBar))
-        menuBar.addMenu(menus.Preferences(menuBar))
-        menuBar.addMenu(menus.Help(menuBar))
-
-        self.show()
-        self.tw.currentChanged.emit(0)
+        for menu in (menus.Utilities, menus.File, menus.Freelancer, menus.Preferences, menus.Help):
+            with tracer.span(f'menus.{menu.__name__}'):
+                menuBar.addMenu(menu(menuBar))
+
+        with tracer.span('show'):
+            self.show()
+        # load the first tab once the event loop has had a chance to paint the window, as Navmap starts QtWebEngine
+        QtCore.QTimer.singleShot(0, self.onShown)
         logging.info('Main window loaded')
 
         self.indicator = loading.Indicator(self.statusBar())
 
+        # once game data has loaded, load the other tabs while the user is idle. Navmap is last, as it starts
+        # QtWebEngine
+        self.preloader = Preloader([self.merchant, self.roster, self.navmap])
+        loading.gameData.loaded.connect(self.preloader.start)
+
+    def onShown(self):
+        """Log the time taken to show the window, then load the current tab."""
+        logging.info(f'Main window shown {time.perf_counter() - STARTED:.2f} s after start')
+        with tracer.span('load first tab'):
+            self.tw.currentChanged.emit(self.tw.currentIndex())
+
     def resizeEvent(self, event):
         """Ensure banner "sticks" to the top right of the window."""
         self.banner.updatePosition()
 
     def closeEvent(self, event):
-        """Write config to disk on close."""
+        """Stop preloading and write config to disk on close."""
+        self.preloader.cancel()
         config.commit()
 
     def addTab(self, page, load):
@@ -114,8 +136,9 @@ class MainWindow(QtWidgets.QMainWindow):
         return lambda: load() if self.tw.currentWidget() is layout else None
 
     @cached  # bit of a hack - using flint's decorator
-    def expandedMap(self) -> ExpandedMap:
+    def expandedMap(self) -> 'ExpandedMap':
         """Initialise the expanded map."""
+        from ...windows.boxes.expandedmap import ExpandedMap
         return ExpandedMap()
 
     @cached
@@ -126,7 +149,7 @@ class MainWindow(QtWidgets.QMainWindow):
     @cached
     def merchant(self) -> Merchant:
         """Load Merchant."""
-        return Merchant(self.tabMer, self.expandedMap(), self.navmap())
+        return Merchant(self.tabMer, self.expandedMap, self.navmap)
 
     @cached
     def roster(self) -> Roster:
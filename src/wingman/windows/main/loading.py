@@ -17,32 +17,73 @@ You should have received a copy of the GNU General Public License
 along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 
 This file defines a loading indicator that displays the progress
-of flint lazy-loading at application start.
+of flint lazy-loading at application start, and the reloading of
+game data that has changed since.
 """
+from typing import Callable, Dict, List, Optional, Set
+import functools
 import logging
+import os
+import threading
 
 from PyQt5 import QtCore, QtWidgets
 import flint as fl
 
+from ... import app, snapshot
+from ...gamefiles import gameFiles, kindFiles, reparse, workerPool, parseInWorker, serveParsed
+from ...stages import Stage, StageGraph
+from ...tracing import tracer
+from ...trade import getMarketIndex, getDockingMatrix, getJumpTable, getTravelTimes, getHeatmap
+from ...models.labels import getBaseLabels
+
+
+def loadUniverse():
+    """Generate the universe graph, which parses the contents of every system."""
+    fl.maps.generate_universe_graph()
+    getJumpTable()
+
+
+def loadMarkets():
+    """Parse markets and build the structures Merchant uses to query them."""
+    fl.routines.get_markets()
+    getMarketIndex()
+    getDockingMatrix()
+    getTravelTimes()
+    getBaseLabels()
+
+
+# Systems, the rest of the universe, equipment and goods are parsed at once in worker processes, as none depends on
+# another. Systems are parsed alone so that the navmap can be used while the rest loads. Markets are built from the
+# bases in each system's contents, so wait for the universe stage rather than parsing those contents a second time.
+# Routines are looked up when each stage runs, as a restored snapshot replaces them
+STAGES = StageGraph([
+    Stage('systems', lambda: fl.get_systems(), parse=functools.partial(parseInWorker, ('get_systems',))),
+    Stage('universe', loadUniverse, after=('systems',),
+          parse=functools.partial(parseInWorker, ('get_bases', 'get_factions'), contents=True)),
+    Stage('equipment', lambda: fl.get_equipment(), parse=functools.partial(parseInWorker, ('get_equipment',))),
+    Stage('goods', lambda: fl.get_goods(), parse=functools.partial(parseInWorker, ('get_goods',))),
+    Stage('markets', loadMarkets, after=('universe', 'equipment', 'goods')),
+])
+
 
 class Thread(QtCore.QThread):
     """Run expensive routines in flint in a thread."""
     jobFinished = QtCore.pyqtSignal(str)
 
     def run(self):
-        """Call flint functions and emit a signal when each one is complete."""
-        fl.get_systems()
-        self.jobFinished.emit('systems')
-        fl.maps.generate_universe_graph()
-        self.jobFinished.emit('universe')
-        fl.get_equipment()
-        self.jobFinished.emit('equipment')
-        fl.get_goods()
-        self.jobFinished.emit('goods')
-        fl.routines.get_markets()
-        self.jobFinished.emit('markets')
+        """Run each loading stage, emitting a signal when each one is complete."""
+        gameFiles.record()  # before parsing, so that files changed while loading are reloaded later
+        if snapshot.current.restored:  # nothing to parse
+            STAGES.run(self.jobFinished.emit)
+        else:
+            with workerPool(sum(s.parse is not None for s in STAGES.stages.values())) as executor:
+                STAGES.run(self.jobFinished.emit, executor, serveParsed)
+        STAGES.log()
+        if not snapshot.current.restored:
+            snapshot.save()
+        getHeatmap()  # not needed at start, so not counted in TOTAL_CALLS
 
-    TOTAL_CALLS = 5  # total number of flint calls made
+    TOTAL_CALLS = len(STAGES.stages)  # total number of stages run
 
 
 class Indicator:
@@ -57,6 +98,8 @@ class Indicator:
         self.statusBar.addPermanentWidget(self.bar)
 
         self.thread.jobFinished.connect(self.update)
+        self.thread.jobFinished.connect(gameData.onStageFinished)
+        self.thread.finished.connect(gameData.onLoadingFinished)
         self.thread.start()
 
     def update(self, name):
@@ -69,4 +112,158 @@ class Indicator:
             self.statusBar.removeWidget(self.bar)
             self.statusBar.clearMessage()
             self.statusBar.hide()
+
+
+class Reloader(QtCore.QThread):
+    """Reparse the game files that have changed since they were loaded, without touching the data in use."""
+    parsed = QtCore.pyqtSignal('PyQt_PyObject', 'PyQt_PyObject')  # emits the kinds of data changed and a snapshot
+
+    def __init__(self):
+        super().__init__()
+        self.swapped = threading.Event()
+
+    def run(self):
+        """Parse the kinds of data whose files have changed afresh in a worker process. Once the GUI thread has
+        swapped them in, rebuild what was derived from the old data and save a snapshot for the next start."""
+        previous = gameFiles.fingerprints
+        kinds = gameFiles.changed()
+        gameFiles.record()  # before parsing, so that files changed while parsing are reloaded later
+        if not kinds:
+            self.parsed.emit(kinds, None)
+            return
+
+        logging.info(f'Reloading {", ".join(sorted(kinds))}')
+        try:
+            data = reparse(kinds)
+        except Exception:
+            logging.exception('Reloading game files failed')
+            data = None
+        if data is None or self.isInterruptionRequested():
+            gameFiles.fingerprints = previous
+            return
+
+        self.swapped.clear()
+        self.parsed.emit(kinds, data)
+        while not self.swapped.wait(0.1):  # the GUI thread stops handling signals on quit
+            if self.isInterruptionRequested():
+                return
+        STAGES.run()
+        STAGES.log()
+        if self.isInterruptionRequested():
+            return
+        snapshot.save()
+        getHeatmap()
+
+
+class Watcher:
+    """Watches the game files, and reloads them once they have stopped changing."""
+    DELAY = 2000  # ms to wait after the last change, as patches touch many files
+
+    def __init__(self, gameData: 'GameData'):
+        self.watcher = QtCore.QFileSystemWatcher()
+        self.timer = QtCore.QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.DELAY)
+
+        self.watcher.fileChanged.connect(lambda path: self.timer.start())
+        self.watcher.directoryChanged.connect(lambda path: self.timer.start())
+        self.timer.timeout.connect(gameData.reload)
+        gameData.changed.connect(self.watch)
+
+    def watch(self):
+        """Watch every file Wingman parses and every directory under DATA. Files that are replaced rather than
+        modified stop being watched, so this is repeated after each reload."""
+        paths = {path for files in kindFiles().values() for path in files}
+        paths.update(directory for directory, _, _ in os.walk(os.path.join(fl.paths.install, 'DATA')))
+        watched = self.watcher.files() + self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+        self.watcher.addPaths(sorted(paths))
+
+
+class GameData(QtCore.QObject):
+    """Announces changes to the loaded game data, so that views can refresh in place."""
+    ready = QtCore.pyqtSignal(str)  # emits the name of each stage of loading at start (see STAGES) as it finishes
+    loaded = QtCore.pyqtSignal()  # emitted when loading at start has finished
+    changed = QtCore.pyqtSignal('PyQt_PyObject')  # emits the set of kinds of data that changed (see gamefiles.py)
+
+    def __init__(self):
+        super().__init__()
+        self.reloader = Reloader()
+        self.reloader.parsed.connect(self.onParsed)
+        self.reloader.finished.connect(self.onReloaderFinished)
+        app.aboutToQuit.connect(self.onAboutToQuit)
+        self.pending = False  # whether a reload was requested while loading or another reload was running
+        self.loading = True  # whether loading at start is still running (see Thread)
+        self.watcher: Optional[Watcher] = None
+        self.readyStages: Set[str] = set()
+        self.waiting: Dict[str, List[Callable[[], None]]] = {}  # stage name -> callbacks waiting for it
+
+    def whenReady(self, stage: str, callback: Callable[[], None]):
+        """Call `callback` once the loading stage `stage` has finished, or immediately if it already has. Features
+        needing only some of the game data can use this to become usable before the rest has loaded."""
+        if stage not in STAGES.stages:
+            raise ValueError(f'no stage named {stage!r}')
+        if stage in self.readyStages:
+            callback()
+        else:
+            self.waiting.setdefault(stage, []).append(callback)
+
+    def onStageFinished(self, name: str):
+        """Announce that a stage of loading at start has finished, and once all have, start watching the game
+        files."""
+        self.readyStages.add(name)
+        self.ready.emit(name)
+        for callback in self.waiting.pop(name, []):
+            callback()
+
+        if self.readyStages.issuperset(STAGES.stages):
             logging.info('Game data loaded')
+            self.watch()
+            self.loaded.emit()
+            tracer.write()
+
+    def watch(self):
+        """Start reloading the game files automatically when they change."""
+        if self.watcher is None:
+            self.watcher = Watcher(self)
+        self.watcher.watch()
+
+    def reload(self):
+        """Reload any game files that have changed, in the background. A reload requested while loading at start is
+        still running is started once it has finished, as both replace flint's data."""
+        if self.loading or self.reloader.isRunning():
+            self.pending = True
+        else:
+            self.reloader.start()
+
+    def onParsed(self, kinds: set, data: Optional[dict]):
+        """Swap in newly parsed data. This happens on the GUI thread, so views never see a mixture of old and new
+        data."""
+        if not kinds:
+            logging.info('Game files unchanged')
+            return
+        try:
+            gameFiles.swap(kinds, data)
+        finally:
+            self.reloader.swapped.set()
+        self.changed.emit(kinds)
+
+    def onAboutToQuit(self):
+        """Stop reloading, so that the reloader isn't destroyed while running."""
+        self.reloader.requestInterruption()
+        self.reloader.wait()
+
+    def onLoadingFinished(self):
+        """Start a reload requested while loading at start."""
+        self.loading = False
+        self.onReloaderFinished()
+
+    def onReloaderFinished(self):
+        """Start a reload requested while the last was running, if any."""
+        if self.pending:
+            self.pending = False
+            self.reloader.start()
+
+
+gameData = GameData()
@@ -28,6 +28,7 @@ import flint as fl
 
 from ..database.layout import Database
 from ..boxes import configuration, about
+from . import loading
 from ... import config, IS_WIN, app, restart
 
 if IS_WIN:
@@ -161,7 +162,7 @@ class File(SimpleMenu):
 
         SimpleAction('Reload game files')
             .withShortcut('Ctrl+R')
-            .onTrigger(lambda: fl.invalidate_cache() or restart()),
+            .onTrigger(lambda: loading.gameData.reload()),
     ]
 
     submenus = [
@@ -86,6 +86,18 @@ class MerchantTab(QtWidgets.QWidget):
         self.contrabandCheck = QtWidgets.QCheckBox('Include contraband')
         self.advancedControlsLayout.addWidget(self.contrabandCheck)
 
+        self.rankByTimeCheck = QtWidgets.QCheckBox('Rank by profit/min')
+        self.rankByTimeCheck.setToolTip('Rank routes by the estimated profit per minute of travel, per unit of cargo')
+        self.advancedControlsLayout.addWidget(self.rankByTimeCheck)
+
+        self.cruiseSpeedLabel = QtWidgets.QLabel('Cruise speed:')
+        self.advancedControlsLayout.addWidget(self.cruiseSpeedLabel)
+
+        self.cruiseSpeedSelector = QtWidgets.QSpinBox()
+        self.cruiseSpeedSelector.setRange(1, 10_000)
+        self.cruiseSpeedSelector.setSuffix(' m/s')
+        self.advancedControlsLayout.addWidget(self.cruiseSpeedSelector)
+
         self.reputationLabel = QtWidgets.QCheckBox('Dockable by:')
         self.advancedControlsLayout.addWidget(self.reputationLabel)
 
@@ -94,6 +106,41 @@ class MerchantTab(QtWidgets.QWidget):
         self.reputationLabel.toggled.connect(self.reputationSelector.setEnabled)
         self.advancedControlsLayout.addWidget(self.reputationSelector)
 
+        self.advancedControlsLayout.addSpacing(25)
+
+        self.loopLegsSelector = QtWidgets.QSpinBox()
+        self.loopLegsSelector.setRange(2, 5)
+        self.loopLegsSelector.setValue(3)
+        self.loopLegsSelector.setSuffix(' legs')
+        self.loopLegsSelector.setToolTip('Number of legs in each loop')
+        self.advancedControlsLayout.addWidget(self.loopLegsSelector)
+
+        self.loopJumpsSelector = QtWidgets.QSpinBox()
+        self.loopJumpsSelector.setRange(0, 20)
+        self.loopJumpsSelector.setValue(4)
+        self.loopJumpsSelector.setPrefix('≤ ')
+        self.loopJumpsSelector.setSuffix(' jumps/leg')
+        self.loopJumpsSelector.setToolTip('Maximum number of jumps in each leg of a loop')
+        self.advancedControlsLayout.addWidget(self.loopJumpsSelector)
+
+        self.loopButton = QtWidgets.QPushButton('Find loops')
+        self.loopButton.setToolTip('Find the most profitable circular routes starting in the origin system')
+        self.advancedControlsLayout.addWidget(self.loopButton)
+
+        self.advancedControlsLayout.addSpacing(25)
+
+        self.shipSelector = QtWidgets.QComboBox()
+        self.shipSelector.setToolTip('Ship to plan cargo for')
+        self.advancedControlsLayout.addWidget(self.shipSelector)
+
+        self.budgetSelector = QtWidgets.QSpinBox()
+        self.budgetSelector.setRange(0, 2_000_000_000)
+        self.budgetSelector.setSingleStep(100_000)
+        self.budgetSelector.setPrefix('$')
+        self.budgetSelector.setGroupSeparatorShown(True)
+        self.budgetSelector.setToolTip('Credits available to spend on cargo')
+        self.advancedControlsLayout.addWidget(self.budgetSelector)
+
         self.advancedControlsLayout.setAlignment(QtCore.Qt.AlignRight)
 
         self.tableLayout.addWidget(self.advancedControls)
@@ -102,9 +149,19 @@ class MerchantTab(QtWidgets.QWidget):
         self.advancedControls.hide()
         self.advancedButton.toggled.connect(self.advancedControls.setVisible)
 
-        self.mainTable = SimpleTable(['Commodity', 'Profit/unit', 'Origin', 'Destination'])
+        self.mainTable = SimpleTable(['Commodity', 'Profit/unit', 'Profit/min', 'Origin', 'Destination'])
         self.tableLayout.addWidget(self.mainTable)
 
+        self.pagingLayout = QtWidgets.QHBoxLayout()
+        self.shownLabel = QtWidgets.QLabel()
+        self.pagingLayout.addWidget(self.shownLabel)
+        self.pagingLayout.addStretch(1)
+        self.moreButton = QtWidgets.QPushButton('Show more')
+        self.moreButton.setToolTip('Show the next most profitable routes')
+        self.moreButton.setEnabled(False)
+        self.pagingLayout.addWidget(self.moreButton)
+        self.tableLayout.addLayout(self.pagingLayout)
+
         self.mainLayout.addLayout(self.tableLayout)
 
         self.infoLayout = QtWidgets.QVBoxLayout()
@@ -135,6 +192,27 @@ class MerchantTab(QtWidgets.QWidget):
         self.infoSellLayout.setTextFormat(QtCore.Qt.RichText)
         self.infoSellLayout.setWordWrap(True)
         self.infoLayout.addWidget(self.infoSellLayout)
+
+        self.infoCargoLabel = QtWidgets.QLabel()
+        self.infoCargoLabel.setMaximumWidth(128)
+        self.infoCargoLabel.setAlignment(QtCore.Qt.AlignCenter)
+        self.infoCargoLabel.setTextFormat(QtCore.Qt.RichText)
+        self.infoCargoLabel.setWordWrap(True)
+        self.infoLayout.addWidget(self.infoCargoLabel)
+
+        self.infoCorrectButton = QtWidgets.QToolButton()
+        self.infoCorrectButton.setText('Correct prices')
+        self.infoCorrectButton.setToolTip('Correct the prices of this route to those seen in game')
+        self.infoCorrectButton.setPopupMode(QtWidgets.QToolButton.InstantPopup)
+        self.infoCorrectMenu = QtWidgets.QMenu()
+        self.infoCorrectBuyAction = self.infoCorrectMenu.addAction('Correct buy price…')
+        self.infoCorrectSellAction = self.infoCorrectMenu.addAction('Correct sell price…')
+        self.infoCorrectMenu.addSeparator()
+        self.infoResetAction = self.infoCorrectMenu.addAction('Reset to game prices')
+        self.infoCorrectButton.setMenu(self.infoCorrectMenu)
+        self.infoCorrectButton.setEnabled(False)
+        self.infoLayout.addWidget(self.infoCorrectButton, alignment=QtCore.Qt.AlignCenter)
+
         self.infoLayout.addStretch(1)
 
         self.infoDivider = QtWidgets.QFrame()
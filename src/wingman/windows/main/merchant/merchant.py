@@ -16,29 +16,96 @@ GNU General Public License for more details.
 You should have received a copy of the GNU General Public License
 along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 """
-from typing import Tuple, Optional
-from collections import defaultdict
+from typing import Callable, List, Set, Tuple, Optional, TYPE_CHECKING
+from concurrent.futures import Future
+import logging
 
 from PyQt5 import QtCore, QtWidgets
 import flint as fl
+import numpy as np
 
-from .... import config, icons
-from ...boxes import expandedmap
+from .... import app, config, icons
 from ....models import items, selectors
+from ....models.labels import baseLabel
+from ....models.routes import RouteTableModel, LoopTableModel
+from ....trade import Routes, Loop, getMarketIndex, getDockingMatrix, getJumpTable, getTravelTimes, getLoopFinder, \
+    mergeLoops, optimiseCargo, routesBetween, routeCacheStatistics, getHeatmap, heatmapReady, correctPrice, \
+    getPriceOverrides
 from .layout import MerchantTab
 from ..navmap.navmap import Navmap
+from ..loading import gameData
+
+if TYPE_CHECKING:
+    from ...boxes import expandedmap  # not imported at runtime, as it loads QtWebEngine
+
+
+class LoopSearch(QtCore.QObject):
+    """Relays the results of a loop search from the threads that collect them to the GUI thread."""
+    found = QtCore.pyqtSignal(int, 'PyQt_PyObject')  # emits a search's generation and a list of loops
+
+
+class RouteQuery(QtCore.QRunnable):
+    """Calculates the routes between the selected systems, and the rate of each, in a pool thread."""
+    class Relay(QtCore.QObject):
+        """Relays the result of a query to the GUI thread."""
+        finished = QtCore.pyqtSignal(int, 'PyQt_PyObject', 'PyQt_PyObject')  # emits generation, routes, rates
+
+    def __init__(self, merchant: 'Merchant', generation: int, origin: fl.entities.System,
+                 destination: Optional[fl.entities.System], iff: Optional[fl.entities.Faction], cruiseSpeed: int):
+        super().__init__()
+        self.merchant = merchant
+        self.generation = generation
+        self.arguments = origin, destination, iff, cruiseSpeed
+
+    def run(self):
+        """Run the query, unless it has been superseded while it was waiting to start."""
+        if self.generation != self.merchant.queryGeneration:
+            return
+        try:
+            routes, rates = self.merchant.queryRoutes(*self.arguments)
+        except Exception:
+            logging.exception('Route query failed')
+            return
+        self.merchant.queryRelay.finished.emit(self.generation, routes, rates)
 
 
 class Merchant:
     """Implements the 'Merchant' tab's behaviour."""
-
-    def __init__(self, widget: MerchantTab, expandedMap: expandedmap.ExpandedMap, navmap: Navmap):
-        # initialise Merchant tab
+    PAGE_SIZE = 100  # the number of routes added to the table at a time
+    BEST_DESTINATIONS = 10  # the number of systems listed in the destination selector's tooltip
+    QUERY_DELAY = 150  # ms to wait for the selection to settle before running a query
+
+    def __init__(self, widget: MerchantTab, expandedMap: Callable[[], 'expandedmap.ExpandedMap'],
+                 navmap: Callable[[], Navmap]):
+        # initialise Merchant tab. Maps are passed as functions which create them when first called, so that QtWebEngine
+        # isn't started until one is needed
         self.config = config['merchant']
         self.widget = widget
         self.expandedMap = expandedMap
         self.navmap = navmap
         self.lastDestination: Optional[fl.entities.System] = None
+        self.routes: Optional[Routes] = None
+        self.rates: Optional[np.ndarray] = None  # estimated profit per minute of each route
+        self.shownRoutes = 0
+        self.rankKey: Optional[np.ndarray] = None
+        self.routeModel = RouteTableModel()
+        self.loopModel = LoopTableModel()
+        self.loopSearch = LoopSearch()
+        self.loopFutures: List[Future] = []
+        self.loopGeneration = 0  # incremented on each search, so that results from superseded searches are ignored
+        self.loopCycles: Set[Tuple[int, ...]] = set()  # the cycles of the loops found so far (see Loop.cycle)
+
+        # queries run in their own pool. A query is only started once the selection has been unchanged for
+        # QUERY_DELAY ms, and a query whose generation is no longer current is discarded
+        self.queryPool = QtCore.QThreadPool()
+        self.queryPool.setMaxThreadCount(1)
+        self.queryRelay = RouteQuery.Relay()
+        self.queryGeneration = 0
+        self.queryTimer = QtCore.QTimer()
+        self.queryTimer.setSingleShot(True)
+        self.queryTimer.setInterval(self.QUERY_DELAY)
+        self.cargoRoute: Optional[Tuple[int, int]] = None  # market index bases of the selected route
+        self.selectedRoute: Optional[items.ProfitItem.ProfitData] = None
 
         # create models
         systemsModel = selectors.SystemSelectionModel()
@@ -51,6 +118,15 @@ class Merchant:
 
         self.widget.reputationSelector.setModel(selectors.FactionSelectionModel())
 
+        self.widget.rankByTimeCheck.setChecked(self.config.getboolean('rank_by_time', fallback=False))
+        self.widget.cruiseSpeedSelector.setValue(
+            self.config.getint('cruise_speed', fallback=fl.maps.DEFAULT_CRUISE_SPEED))
+
+        self.widget.shipSelector.setModel(selectors.ShipSelectionModel())
+        self.widget.shipSelector.setCurrentIndex(
+            max(self.widget.shipSelector.findData(fl.ships.get(self.config.get('ship', fallback=''))), 0))
+        self.widget.budgetSelector.setValue(self.config.getint('budget', fallback=1_000_000))
+
         # connections
         self.widget.originSelector.currentIndexChanged.connect(self.display)
         self.widget.destinationLabel.toggled.connect(self.onDestinationToggled)
@@ -58,6 +134,20 @@ class Merchant:
         self.widget.reputationLabel.clicked.connect(self.display)
         self.widget.reputationSelector.currentIndexChanged.connect(self.display)
         self.widget.swapButton.clicked.connect(self.swapSystems)
+        self.widget.moreButton.clicked.connect(self.showMore)
+        self.widget.rankByTimeCheck.toggled.connect(self.display)
+        self.widget.cruiseSpeedSelector.valueChanged.connect(self.display)
+        self.widget.loopButton.clicked.connect(self.findLoops)
+        self.widget.shipSelector.currentIndexChanged.connect(self.updateCargoPlan)
+        self.widget.budgetSelector.valueChanged.connect(self.updateCargoPlan)
+        self.widget.infoCorrectBuyAction.triggered.connect(lambda: self.correctSelectedPrice(buy=True))
+        self.widget.infoCorrectSellAction.triggered.connect(lambda: self.correctSelectedPrice(buy=False))
+        self.widget.infoResetAction.triggered.connect(self.resetSelectedPrices)
+        self.loopSearch.found.connect(self.onLoopsFound)
+        app.aboutToQuit.connect(getLoopFinder.cache_clear)  # stop the loop search's worker processes
+        self.queryTimer.timeout.connect(self.startQuery)
+        self.queryRelay.finished.connect(self.onQueryFinished)
+        gameData.changed.connect(self.onGameDataChanged)
 
         # customise table and model
         self.widget.mainTable.selectionModel().selectionChanged.connect(self.onSelectedRowChanged)
@@ -67,10 +157,45 @@ class Merchant:
             (items.fl.systems.get(self.config['last_origin']), items.fl.systems.get(self.config['last_destination']))
 
     def openUniverseMap(self, selector: QtWidgets.QComboBox):
-        """Open the universe map, passing its choice to the given combo box."""
-        self.expandedMap.displayUniverse()
-        self.expandedMap.displayChanged.connect(lambda n:
-                                                selector.setCurrentIndex(selector.findData(items.fl.systems[n])))
+        """Open the universe map, passing its choice to the given combo box. When choosing a destination, systems are
+        coloured by the best trade that can be made to them from the origin, once the heatmap is ready."""
+        origin = self.widget.originSelector.currentData()
+        heat = None
+        if selector is self.widget.destinationSelector and origin and heatmapReady():
+            heatmap = getHeatmap()
+            profits = heatmap.fromSystem(origin)
+            best = max(int(profits.max(initial=0)), 1)
+            heat = {s.nickname: (int(p) / best, f'Best trade from {origin.name()}: ${int(p):,}/unit')
+                    for s, p in zip(heatmap.systems, profits) if p > 0}
+        expandedMap = self.expandedMap()
+        expandedMap.displayUniverse(heat=heat)
+        expandedMap.displayChanged.connect(lambda n:
+                                           selector.setCurrentIndex(selector.findData(items.fl.systems[n])))
+
+    def onGameDataChanged(self, kinds: set):
+        """Rebuild the selectors whose entities have been reloaded, keeping their selections, then query again."""
+        self.cancelQuery()
+        self.cancelLoopSearch()
+        widget = self.widget
+        if kinds & {'universe', 'resources'}:
+            systemsModel = selectors.SystemSelectionModel()
+            self.replaceModel(widget.originSelector, systemsModel)
+            self.replaceModel(widget.destinationSelector, systemsModel)
+        if kinds & {'factions', 'resources'}:
+            self.replaceModel(widget.reputationSelector, selectors.FactionSelectionModel())
+        if kinds & {'ships', 'resources'}:
+            self.replaceModel(widget.shipSelector, selectors.ShipSelectionModel())
+        self.display()
+
+    @staticmethod
+    def replaceModel(selector: QtWidgets.QComboBox, model):
+        """Replace the model of a selector without emitting signals. Entities are compared by nickname, so the
+        selected entity's replacement is selected."""
+        selected = selector.currentData()
+        selector.blockSignals(True)
+        selector.setModel(model)
+        selector.setCurrentIndex(selector.findData(selected) if selected is not None else -1)
+        selector.blockSignals(False)
 
     def onDestinationToggled(self, toggled: bool):
         """Handle the specific destination check box being toggled."""
@@ -88,17 +213,27 @@ class Merchant:
         """Handle the table's selected row being changed."""
         if not selected.indexes():
             return
-        commodity, profit, origin, destination = (item.data(QtCore.Qt.UserRole) for item in selected.indexes())
+        commodity, profit, rate, origin, destination = (item.data(QtCore.Qt.UserRole) for item in selected.indexes())
+        if isinstance(profit, items.LoopData):
+            self.cargoRoute = self.selectedRoute = None
+            self.widget.infoCorrectButton.setEnabled(False)
+            self.updateLoopInfoPanel(profit)
+            return
 
         # display commodity icon
         self.updateInfoPanel(profit)
+        index = getMarketIndex()
+        self.cargoRoute = index.baseIndex[origin], index.baseIndex[destination]
+        self.selectedRoute = profit
+        self.widget.infoCorrectButton.setEnabled(True)
+        self.updateCargoPlan()
 
         # display commodity name
         links = []
-        for system in items.fl.maps.inter_system_route(origin.system(), destination.system()):
+        for system in getJumpTable().route(origin.system(), destination.system()):
             links.append(f'<a href={system.nickname!r}>{system.name()}</a>')
         self.widget.infoRouteLabel.setText('Route: ' + ', '.join(links))
-        self.widget.infoRouteLabel.linkActivated.connect(lambda n: self.navmap.showFromExternal(items.fl.systems[n]))
+        self.widget.infoRouteLabel.linkActivated.connect(lambda n: self.navmap().showFromExternal(items.fl.systems[n]))
 
     def updateInfoPanel(self, data: items.ProfitItem.ProfitData):
         """Update the info side panel."""
@@ -109,23 +244,218 @@ class Merchant:
         self.widget.infoBuyLabel.setText(data.label(buy=True))
         self.widget.infoSellLayout.setText(data.label(buy=False))
 
+    def updateLoopInfoPanel(self, data: items.LoopData):
+        """Update the info side panel for a loop."""
+        self.widget.infoIcon.setPixmap(icons.loadTGA(data.commodities[0].icon()))
+        self.widget.infoNameLabel.setText(f'<b>{len(data.bases)}-leg loop</b>')
+        self.widget.infoBuyLabel.setText(data.label())
+        self.widget.infoSellLayout.setText('')
+        self.widget.infoCargoLabel.setText('')
+
+        links = []
+        for origin, destination in zip(data.bases, data.bases[1:] + data.bases[:1]):
+            for system in getJumpTable().route(origin.system(), destination.system())[1:]:
+                links.append(f'<a href={system.nickname!r}>{system.name()}</a>')
+        self.widget.infoRouteLabel.setText('Route: ' + ', '.join(links))
+        self.widget.infoRouteLabel.linkActivated.connect(lambda n: self.navmap().showFromExternal(items.fl.systems[n]))
+
+    def updateCargoPlan(self):
+        """Show the best cargo to carry along the selected route in the selected ship, given the budget."""
+        ship = self.widget.shipSelector.currentData()
+        budget = self.widget.budgetSelector.value()
+        if ship:
+            self.config['ship'] = ship.nickname
+        self.config['budget'] = str(budget)
+
+        if not ship or self.cargoRoute is None:
+            self.widget.infoCargoLabel.setText('')
+            return
+
+        index = getMarketIndex()
+        plan = optimiseCargo(index, *self.cargoRoute, ship.hold_size, budget)
+        if not plan.quantities:
+            self.widget.infoCargoLabel.setText('No cargo can be afforded')
+            return
+        lines = [f'{quantity:,} × {index.goods[good].name()}' for good, quantity in plan.quantities.items()]
+        self.widget.infoCargoLabel.setText(
+            f'<b>Best cargo for {ship.name()}</b><br>' + '<br>'.join(lines) +
+            f'<br>Cost: ${plan.cost:,}<br>Hold: {plan.volume:,}/{ship.hold_size:,}<br>Profit: ${plan.profit:,}')
+
+    def selectedGood(self) -> fl.entities.CommodityGood:
+        """The market good traded on the selected route."""
+        return next(g for g in getMarketIndex().goods if g.commodity() == self.selectedRoute.commodity)
+
+    def correctSelectedPrice(self, buy: bool):
+        """Ask for the price seen in game at one end of the selected route and correct it, updating the table."""
+        data = self.selectedRoute
+        base, price = (data.buyBase, data.buyPrice) if buy else (data.sellBase, data.sellPrice)
+        observed, accepted = QtWidgets.QInputDialog.getInt(
+            self.widget, 'Correct price',
+            f'{"Buy" if buy else "Sell"} price of {data.commodity.name()} at {baseLabel(base).name}:',
+            price, 0, 2 ** 31 - 1)
+        if accepted and observed != price:
+            correctPrice(base, self.selectedGood(), observed, buy)
+            self.display()
+
+    def resetSelectedPrices(self):
+        """Remove any corrections to the prices of the selected route."""
+        data, good = self.selectedRoute, self.selectedGood()
+        overrides = getPriceOverrides()
+        for base, price, buy in ((data.buyBase, data.buyPrice, True), (data.sellBase, data.sellPrice, False)):
+            delta = overrides.delta(base, good, buy)
+            if delta:
+                correctPrice(base, good, price - delta, buy)
+        self.display()
+
+    def selectedIff(self) -> Optional[fl.entities.Faction]:
+        """Return the faction selected to filter bases by, if any."""
+        return self.widget.reputationSelector.itemData(self.widget.reputationSelector.currentIndex()) \
+            if self.widget.reputationLabel.isChecked() else None
+
     def display(self):
-        """Display a table of the best commodities to take to and from the selected systems."""
+        """Display a table of the best commodities to take to and from the selected systems. The query is run in the
+        background once the selection has settled."""
+        self.cancelLoopSearch()
+        self.queryTimer.start()
+
+    def startQuery(self):
+        """Start a query for the selected systems, superseding any query already queued or running."""
         originSystem = self.widget.originSelector.itemData(self.widget.originSelector.currentIndex())
         destinationSystem = self.widget.destinationSelector.itemData(self.widget.destinationSelector.currentIndex()) \
             if self.widget.destinationLabel.isChecked() else None
-        iff = self.widget.reputationSelector.itemData(self.widget.reputationSelector.currentIndex()) \
-            if self.widget.reputationLabel.isChecked() else None
+        iff = self.selectedIff()
+        cruiseSpeed = self.widget.cruiseSpeedSelector.value()
 
         self.widget.swapButton.setEnabled(bool(destinationSystem))
+        if not originSystem:
+            return
+        self.updateBestDestinations(originSystem)
 
-        data = self.calculateRoutes(originSystem, destinationSystem, iff)
-        self.widget.mainTable.populate(list(data))
-        self.widget.mainTable.sortByColumn(1, QtCore.Qt.DescendingOrder)  # sort by 'credits/unit' column
-        self.widget.mainTable.selectRow(0)
+        self.cancelQuery()
+        self.queryPool.start(RouteQuery(self, self.queryGeneration, originSystem, destinationSystem, iff, cruiseSpeed))
+        self.widget.shownLabel.setText('Calculating routes...')
 
         self.config['last_origin'] = originSystem.nickname
         self.config['last_destination'] = destinationSystem.nickname if destinationSystem else ''
+        self.config['rank_by_time'] = str(self.widget.rankByTimeCheck.isChecked())
+        self.config['cruise_speed'] = str(cruiseSpeed)
+
+    def onQueryFinished(self, generation: int, routes: Routes, rates: np.ndarray):
+        """Populate the table with the result of a query, unless it has since been superseded."""
+        if generation != self.queryGeneration:
+            return
+        rankByTime = self.widget.rankByTimeCheck.isChecked()
+
+        self.routes = routes
+        self.rates = rates
+        self.rankKey = self.rates if rankByTime else None
+        self.shownRoutes = min(self.PAGE_SIZE, len(self.routes))
+        self.widget.mainTable.setSourceModel(self.routeModel)
+        self.routeModel.setRoutes(self.routes, self.rates, self.rankedRoutes(0))
+        if len(self.routes):
+            self.widget.mainTable.resizeColumnsToContents()
+        # sort by 'profit/min' or 'profit/unit' column
+        self.widget.mainTable.sortByColumn(2 if rankByTime else 1, QtCore.Qt.DescendingOrder)
+        self.widget.mainTable.selectRow(0)
+        self.widget.mainTable.horizontalHeader().reset()  # see SimpleTable.populate
+        self.updateShownCount()
+
+    def updateBestDestinations(self, origin: fl.entities.System):
+        """List the systems with the best trades from `origin` in the destination selector's tooltip."""
+        if not heatmapReady():
+            return
+        lines = [f'{system.name()}: ${profit:,}/unit'
+                 for system, profit in getHeatmap().bestDestinations(origin, self.BEST_DESTINATIONS)]
+        self.widget.destinationSelector.setToolTip(f'Best destinations from {origin.name()}:\n' + '\n'.join(lines)
+                                                   if lines else '')
+
+    def cancelQuery(self):
+        """Cancel any query waiting for the selection to settle, queued or running."""
+        self.queryTimer.stop()
+        self.queryGeneration += 1
+        self.queryPool.clear()
+
+    def rankedRoutes(self, start: int) -> np.ndarray:
+        """Return the indices of the page of routes beginning at rank `start`, in the current ranking mode."""
+        return self.routes.ranked(start, start + self.PAGE_SIZE, by=self.rankKey)
+
+    def showMore(self):
+        """Add the next page of routes, in order of profit, to the table."""
+        ranks = self.rankedRoutes(self.shownRoutes)
+        self.routeModel.extend(ranks)
+        header = self.widget.mainTable.horizontalHeader()
+        self.routeModel.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+        self.shownRoutes += len(ranks)
+        self.updateShownCount()
+
+    def updateShownCount(self):
+        """Update the label showing how many of the routes found are displayed, and whether more can be shown."""
+        self.widget.shownLabel.setText(f'Showing {self.shownRoutes:,} of {len(self.routes):,} routes')
+        self.widget.moreButton.setEnabled(self.shownRoutes < len(self.routes))
+
+    def findLoops(self):
+        """Search for the most profitable loops starting in the origin system. Loops are added to the table as they
+        are found; the search runs in worker processes and never blocks the GUI."""
+        self.cancelLoopSearch()
+        self.cancelQuery()
+        index = getMarketIndex()
+        iff = self.selectedIff()
+        allowed = getDockingMatrix().mask(iff) if iff else np.ones(len(index.bases), dtype=bool)
+        origin = self.widget.originSelector.currentData()
+
+        self.widget.mainTable.setSourceModel(self.loopModel)
+        self.loopModel.clear(index)
+        self.widget.moreButton.setEnabled(False)
+        self.loopCycles = set()
+        self.loopFutures = getLoopFinder().search(index.basesIn(origin), self.widget.loopLegsSelector.value(),
+                                                  self.widget.loopJumpsSelector.value(), allowed)
+        for future in self.loopFutures:
+            future.add_done_callback(lambda f, generation=self.loopGeneration: self.onLoopSearchDone(f, generation))
+        self.widget.shownLabel.setText('Searching for loops...' if self.loopFutures else 'No loops found')
+
+    def onLoopSearchDone(self, future: Future, generation: int):
+        """Handle a worker finishing its part of a loop search. This is called from a pool thread."""
+        if future.cancelled():
+            return
+        if future.exception():
+            logging.error('Loop search failed', exc_info=future.exception())
+            return
+        self.loopSearch.found.emit(generation, future.result())
+
+    def onLoopsFound(self, generation: int, loops: List[Loop]):
+        """Add loops to the table, unless they are from a search that has since been superseded. Loops already found
+        from another starting base are skipped."""
+        if generation != self.loopGeneration:
+            return
+        loops = mergeLoops(loops, self.loopCycles)
+        if not loops:
+            return
+        travelTimes = getTravelTimes()
+        cruiseSpeed = self.widget.cruiseSpeedSelector.value()
+        firstResults = not self.loopModel.rowCount()
+
+        rates = []
+        for loop in loops:
+            bases = np.array(loop.bases)
+            minutes = travelTimes.estimate(bases, np.roll(bases, -1), cruiseSpeed).sum() / 60
+            rates.append(loop.profit / minutes)
+        self.loopModel.extend(loops, rates)
+        self.widget.shownLabel.setText(f'Found {self.loopModel.rowCount():,} loops')
+
+        if firstResults:
+            self.widget.mainTable.resizeColumnsToContents()
+            self.widget.mainTable.sortByColumn(1, QtCore.Qt.DescendingOrder)
+            self.widget.mainTable.selectRow(0)
+        else:
+            header = self.widget.mainTable.horizontalHeader()
+            self.loopModel.sort(header.sortIndicatorSection(), header.sortIndicatorOrder())
+
+    def cancelLoopSearch(self):
+        """Cancel any loop search in progress."""
+        self.loopGeneration += 1
+        for future in self.loopFutures:
+            future.cancel()
+        self.loopFutures = []
 
     def swapSystems(self):
         """Swap the currently selected origin and destination systems."""
@@ -147,41 +477,22 @@ class Merchant:
         else:
             self.widget.destinationSelector.setCurrentText('')
 
+    @classmethod
+    def queryRoutes(cls, origin: fl.entities.System, destination: Optional[fl.entities.System],
+                    iff: Optional[fl.entities.Faction], cruiseSpeed: int) -> Tuple[Routes, np.ndarray]:
+        """Calculate routes (see `calculateRoutes`) and the estimated profit per minute of each. This is safe to call
+        from any thread once game data has been loaded."""
+        routes = cls.calculateRoutes(origin, destination, iff)
+        rates = routes.profit / (getTravelTimes().estimate(routes.origin, routes.destination, cruiseSpeed) / 60)
+        return routes, rates
+
     @staticmethod
     def calculateRoutes(origin: items.fl.entities.System, destination: items.Optional[items.fl.entities.System] = None,
-                        iff: items.Optional[items.fl.entities.Faction] = None):
+                        iff: items.Optional[items.fl.entities.Faction] = None) -> Routes:
         """Calculate the optimum commodities to trade between system A (`origin`) and system B (`destination`).
         The latter is optional; if it is not provided the function will return the optimum commodities to buy in
         system A and sell at any location. The optional `iff` parameter allows the bases to be searched to be restricted
-        to those dockable by that faction."""
-        originSells = defaultdict(list)
-        for base in origin.bases():
-            if iff and not iff.can_dock_at(base):
-                continue
-            for good, price in base.universe_base().sells().items():
-                originSells[good].append((price, base))
-
-        if destination:
-            destinationBases = destination.bases()
-        else:
-            destinationBases = {b for s in items.fl.systems for b in s.bases()}
-
-        destBuys = defaultdict(list)
-        for base in destinationBases:
-            if iff and not iff.can_dock_at(base):
-                continue
-            for good, price in base.universe_base().buys().items():
-                destBuys[good].append((price, base))
-
-        for good in originSells:  # for each commodity that are sold in the origin system
-            if good not in destBuys:  # if somewhere buys the commodity in the destination
-                continue
-            for destPrice, destBase in destBuys[good]:  # look through each base in destination
-                for originPrice, originBase in originSells[good]:  # look through each base in origin
-                    if destPrice > originPrice:
-                        yield [
-                            items.CommodityItem(good.commodity()),
-                            items.ProfitItem(originPrice, originBase, destPrice, destBase, good.commodity()),
-                            items.MerchantItem(originBase),
-                            items.MerchantItem(destBase),
-                        ]
+        to those dockable by that faction. Results are cached; see `trade.routesBetween`."""
+        routes = routesBetween(origin, destination, iff)
+        logging.debug(routeCacheStatistics())
+        return routes
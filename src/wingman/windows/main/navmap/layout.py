@@ -18,11 +18,16 @@ along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 
 This file defines the layout of the Navmap tab.
 """
+from typing import Optional, TYPE_CHECKING
+
 from PyQt5 import QtCore, QtGui, QtWidgets
 
-from ....widgets import buttons, mapview, infocardview
+from ....widgets import buttons, infocardview
 from .... import icons, IS_WIN
 
+if TYPE_CHECKING:
+    from ....widgets import mapview  # imported by createMapView, as it loads QtWebEngine
+
 
 class NavmapTab(QtWidgets.QWidget):
     """Defines the layout of the 'Navmap' tab."""
@@ -33,13 +38,14 @@ class NavmapTab(QtWidgets.QWidget):
     def __init__(self, parent: QtWidgets.QTabWidget):
         super().__init__(parent)
         self.mainLayout = QtWidgets.QGridLayout(self)
-        self.navmap = mapview.MapView(self)
-        self.navmap.setMinimumSize(QtCore.QSize(512, 512))
-        self.navmap.setSizePolicy(
+        self.navmap: Optional['mapview.MapView'] = None  # created by createMapView, as this starts QtWebEngine
+        self.mapPlaceholder = QtWidgets.QWidget(self)
+        self.mapPlaceholder.setMinimumSize(QtCore.QSize(512, 512))
+        self.mapPlaceholder.setSizePolicy(
             QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
 
         self.leftLayout = QtWidgets.QVBoxLayout()
-        self.leftLayout.addWidget(self.navmap)
+        self.leftLayout.addWidget(self.mapPlaceholder)
 
         self.mainLayout.addLayout(self.leftLayout, 0, 0)
 
@@ -75,3 +81,16 @@ class NavmapTab(QtWidgets.QWidget):
         self.rightLayout.addWidget(self.infocard)
 
         self.mainLayout.addLayout(self.rightLayout, 0, 1)
+
+    def createMapView(self) -> 'mapview.MapView':
+        """Create the navmap in place of its placeholder, if it has not been created already, and return it. This
+        imports QtWebEngine, which is slow to load, so is deferred until the map is first shown."""
+        if self.navmap is None:
+            from ....widgets import mapview
+            self.navmap = mapview.MapView(self)
+            self.navmap.setMinimumSize(QtCore.QSize(512, 512))
+            self.navmap.setSizePolicy(
+                QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding))
+            self.leftLayout.replaceWidget(self.mapPlaceholder, self.navmap)
+            self.mapPlaceholder.deleteLater()
+        return self.navmap
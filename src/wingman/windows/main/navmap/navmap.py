@@ -18,42 +18,51 @@ along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
 
 This file defines the behaviour of the Navmap tab.
 """
+from typing import Optional, TYPE_CHECKING
+
 from PyQt5 import QtCore, QtWidgets
 import flint as fl
 
 from .... import config, IS_WIN
-from ....widgets import mapview
-from ...boxes import expandedmap
+from ..loading import gameData
 from .layout import NavmapTab
 
+if TYPE_CHECKING:  # not imported at runtime, as these load QtWebEngine
+    from ....widgets import mapview
+    from ...boxes import expandedmap
+
 if IS_WIN:
     import flair
 
 
 class Navmap:
     """Implements the 'Navmap' tab."""
-    def __init__(self, widget: NavmapTab, expandedMap: expandedmap.ExpandedMap):
+    def __init__(self, widget: NavmapTab, expandedMap: 'expandedmap.ExpandedMap'):
         """Initialise tab"""
         self.widget = widget
         self.expandedMap = expandedMap
 
-        self.mapView: mapview.MapView = self.widget.navmap
+        self.mapView: 'mapview.MapView' = self.widget.createMapView()
         self.tabWidget: QtWidgets.QTabWidget = self.widget.parent().parent()
 
         self.config = config['navmap']
 
-        self.searchableEntities = fl.systems + fl.bases
-        self.currentSystem = fl.systems.get(self.config['last']) or fl.systems['li01']
+        # search and the universe map only need the list of systems, so are usable once that has loaded
+        self.searchableEntities = fl.entities.EntitySet([])
+        self.currentSystem: Optional[fl.entities.System] = None
+        self.mapReady = False
+        for control in (self.widget.searchEdit, self.widget.universeButton, self.mapView.expandButton):
+            control.setEnabled(False)
 
-        self.mapView.navmapReady.connect(lambda: self.mapView.displayEntity(self.currentSystem))
-        self.onDisplayChange(self.currentSystem.nickname)
+        self.mapView.navmapReady.connect(self.onNavmapReady)
 
         # set up search field with completer
         completer = QtWidgets.QCompleter()
-        completer.setModel(QtCore.QStringListModel(e.name() for e in self.searchableEntities))
         completer.setCaseSensitivity(QtCore.Qt.CaseInsensitive)
         completer.setWrapAround(True)
         self.widget.searchEdit.setCompleter(completer)
+        gameData.whenReady('systems', self.onSystemsReady)
+        gameData.whenReady('universe', self.onUniverseReady)
 
         # connections
         self.mapView.displayChanged.connect(self.onDisplayChange)
@@ -66,6 +75,7 @@ class Navmap:
         self.mapView.forwardButton.clicked.connect(self.widget.gotoRadioButton.click)
         self.mapView.expandButton.clicked.connect(self.displayExpandedMap)
         self.widget.universeButton.clicked.connect(self.displayUniverseMap)
+        gameData.changed.connect(self.onGameDataChanged)
 
         if IS_WIN:
             self.widget.followRadioButton.setEnabled(flair.state.running)
@@ -76,6 +86,45 @@ class Navmap:
             flair.events.system_changed.connect(self.onFlairSystemChanged)
             self.widget.followRadioButton.toggled.connect(self.onFollowModeEnabled)
 
+    def onSystemsReady(self):
+        """Show the last system displayed and enable search, now that systems have loaded."""
+        self.searchableEntities += fl.systems
+        self.currentSystem = fl.systems.get(self.config['last']) or fl.systems['li01']
+        self.onDisplayChange(self.currentSystem.nickname)
+        self.updateCompleter(self.widget.searchEdit.completer())
+        for control in (self.widget.searchEdit, self.widget.universeButton, self.mapView.expandButton):
+            control.setEnabled(True)
+        if self.mapReady:
+            self.mapView.displayEntity(self.currentSystem)
+
+    def onUniverseReady(self):
+        """Make bases searchable, now that the universe has loaded."""
+        self.searchableEntities += fl.bases
+        self.updateCompleter(self.widget.searchEdit.completer())
+
+    def onNavmapReady(self):
+        """Show the current system once the map has loaded, if systems have too."""
+        self.mapReady = True
+        if self.currentSystem:
+            self.mapView.displayEntity(self.currentSystem)
+
+    def updateCompleter(self, completer: QtWidgets.QCompleter):
+        """Fill the search field's completer with the names of searchable entities."""
+        completer.setModel(QtCore.QStringListModel(e.name() for e in self.searchableEntities))
+
+    def onGameDataChanged(self, kinds: set):
+        """Replace entities after the universe or the strings naming them have been reloaded. If the universe has
+        not finished loading at start, entities are replaced once it has."""
+        if kinds & {'universe', 'resources'}:
+            gameData.whenReady('universe', self.replaceEntities)
+
+    def replaceEntities(self):
+        """Replace the current system and searchable entities with those from the game data now loaded."""
+        nickname = self.currentSystem.nickname if self.currentSystem else self.config['last']
+        self.currentSystem = fl.systems.get(nickname) or fl.systems['li01']
+        self.searchableEntities = fl.systems + fl.bases + self.currentSystem.contents()
+        self.updateCompleter(self.widget.searchEdit.completer())
+
     def onDisplayChange(self, nickname):
         """Handle the mapview changing."""
         entity = self.searchableEntities.get(nickname)
@@ -0,0 +1,79 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines a scheduler that loads tabs in the background
+while the user is idle, so that they open instantly when clicked.
+"""
+from typing import Callable, Iterable
+from collections import deque
+import logging
+import time
+
+from PyQt5 import QtCore
+
+from ... import app
+from ...tracing import tracer
+
+
+class Preloader(QtCore.QObject):
+    """Runs tasks one at a time on the GUI thread, each only once there has been no user input for IDLE_TIME ms.
+    Widgets can only be created on the GUI thread, so rather than running in another thread, tasks yield to input
+    between each other. Each task should be short enough not to cause a noticeable stall."""
+    IDLE_TIME = 500  # ms without user input before a task is run
+    INPUT_EVENTS = {QtCore.QEvent.KeyPress, QtCore.QEvent.MouseButtonPress, QtCore.QEvent.MouseMove,
+                    QtCore.QEvent.Wheel, QtCore.QEvent.TouchBegin}
+
+    def __init__(self, tasks: Iterable[Callable[[], object]]):
+        super().__init__()
+        self.tasks = deque(tasks)
+        self.lastInput = time.perf_counter()
+        self.timer = QtCore.QTimer()
+        self.timer.setInterval(self.IDLE_TIME // 5)
+        self.timer.timeout.connect(self.runNext)
+
+    def start(self):
+        """Start running tasks as the user becomes idle."""
+        if self.tasks and not self.timer.isActive():
+            app.installEventFilter(self)
+            self.timer.start()
+
+    def cancel(self):
+        """Stop running tasks. Tasks not yet run are discarded."""
+        self.tasks.clear()
+        self.timer.stop()
+        app.removeEventFilter(self)
+
+    def eventFilter(self, watched: QtCore.QObject, event: QtCore.QEvent) -> bool:
+        """Note the time of user input. Events are never filtered out."""
+        if event.type() in self.INPUT_EVENTS:
+            self.lastInput = time.perf_counter()
+        return False
+
+    def runNext(self):
+        """Run the next task if the user has been idle for long enough."""
+        if (time.perf_counter() - self.lastInput) * 1000 < self.IDLE_TIME:
+            return
+        task = self.tasks.popleft()
+        name = getattr(task, '__name__', repr(task))
+        try:
+            with tracer.span(f'preload {name}', 'preloading'):
+                task()
+        except Exception:
+            logging.exception(f'Preloading {name} failed')
+        if not self.tasks:
+            self.cancel()
@@ -0,0 +1,175 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file defines fixtures shared by the tests: a minimal Freelancer
+install, and an app data directory to run in. Only Qt-free modules
+are tested.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, 'src'))
+
+import flint as fl  # noqa: E402
+
+# the files of a minimal install: one system containing two bases, one selling a commodity and one buying it
+INSTALL = {
+    'EXE/freelancer.ini': """
+[Freelancer]
+data path = ..\\data
+
+[Resources]
+DLL = x.dll
+
+[Data]
+universe = universe\\universe.ini
+equipment = equipment\\select_equip.ini
+goods = equipment\\goods.ini
+markets = equipment\\market_commodities.ini
+ships = ships\\shiparch.ini
+initial_world = initialworld.ini
+""",
+    'DATA/UNIVERSE/universe.ini': """
+[Base]
+nickname = li01_01_base
+system = li01
+strid_name = 1
+file = universe\\systems\\li01\\bases\\li01_01_base.ini
+
+[Base]
+nickname = li01_02_base
+system = li01
+strid_name = 1
+file = universe\\systems\\li01\\bases\\li01_02_base.ini
+
+[system]
+nickname = li01
+file = systems\\li01\\li01.ini
+strid_name = 2
+ids_info = 3
+navmapscale = 1
+""",
+    'DATA/UNIVERSE/SYSTEMS/LI01/li01.ini': """
+[Object]
+nickname = li01_01
+ids_name = 1
+ids_info = 1
+pos = 1, 2, 3
+archetype = planet
+base = li01_01_base
+reputation = f1
+space_costume = x
+
+[Object]
+nickname = li01_02
+ids_name = 1
+ids_info = 1
+pos = 4, 5, 6
+archetype = station
+base = li01_02_base
+reputation = f1
+space_costume = x
+""",
+    'DATA/EQUIPMENT/select_equip.ini': """
+[Commodity]
+nickname = commodity_gold
+ids_name = 1
+ids_info = 1
+volume = 1
+decay_per_second = 0
+units_per_container = 1
+pod_appearance = x
+loot_appearance = x
+hit_pts = 1
+""",
+    'DATA/EQUIPMENT/goods.ini': """
+[Good]
+nickname = commodity_gold
+equipment = commodity_gold
+category = commodity
+price = 100
+combinable = true
+good_sell_price = 1
+bad_buy_price = 1
+bad_sell_price = 1
+good_buy_price = 1
+shop_archetype = x
+item_icon = x
+jump_dist = 1
+""",
+    'DATA/EQUIPMENT/market_commodities.ini': """
+[BaseGood]
+base = li01_01_base
+MarketGood = commodity_gold, 0, -1, 10, 100, 0, 1.5
+
+[BaseGood]
+base = li01_02_base
+MarketGood = commodity_gold, 0, -1, 0, 0, 0, 3
+""",
+    'DATA/initialworld.ini': """
+[Group]
+nickname = f1
+ids_name = 1
+ids_info = 1
+ids_short_name = 1
+rep = 0.5, f1
+""",
+    'DATA/SHIPS/shiparch.ini': """
+[Ship]
+nickname = ship1
+ids_name = 1
+ids_info = 1
+ids_info1 = 1
+ids_info2 = 1
+ids_info3 = 1
+hold_size = 10
+mass = 1
+hit_pts = 1
+linear_drag = 1
+steering_torque = 1, 1, 1
+angular_drag = 1, 1, 1
+rotation_inertia = 1, 1, 1
+""",
+}
+
+
+def setInstallPath(path: str):
+    """Set flint's install path as the application does at start. The minimal install has no resource DLLs."""
+    fl.paths.set_install_path(path)
+    fl.paths.dlls.clear()
+
+
+@pytest.fixture
+def install(tmp_path, monkeypatch) -> str:
+    """The path to a minimal install. The working directory is changed to an empty app data directory, and flint
+    starts with no install path set, as at application start."""
+    root = tmp_path / 'freelancer'
+    for file, contents in INSTALL.items():
+        path = root / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(contents.lstrip())
+    (root / 'DLLS').mkdir()
+
+    data = tmp_path / 'data'
+    data.mkdir()
+    monkeypatch.chdir(data)
+    monkeypatch.setattr(fl.paths, 'install', None)
+    fl.invalidate_cache()
+    return str(root)
@@ -0,0 +1,49 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests the vectorised route engine.
+"""
+import numpy as np
+
+from wingman.trade.engine import Routes
+
+
+def routesWithProfits(profit: np.ndarray) -> Routes:
+    """Routes with the given profits. Only profit matters to ranking."""
+    zeros = np.zeros(len(profit), dtype=np.intp)
+    return Routes(zeros, zeros, zeros, zeros, zeros, profit)
+
+
+def test_pages_with_ties_are_disjoint():
+    """Pages of routes with many equal profits neither repeat nor skip routes, and together are the start of the
+    full ranking."""
+    profit = np.random.default_rng(0).integers(0, 20, 5000)
+    routes = routesWithProfits(profit)
+    pages = [routes.ranked(start, start + 100) for start in range(0, 300, 100)]
+    joined = np.concatenate(pages)
+    assert len(np.unique(joined)) == len(joined) == 300
+    order = np.lexsort((np.arange(len(profit)), -profit))
+    assert joined.tolist() == order[:300].tolist()
+
+
+def test_ranked_by_key():
+    """Routes can be ranked by another array, and the last page may be short."""
+    routes = routesWithProfits(np.array([5, 5, 1, 3]))
+    assert routes.ranked(0, 2, by=np.array([0.5, 2.0, 2.0, 1.0])).tolist() == [1, 2]
+    assert routes.ranked(2, 10).tolist() == [3, 2]
+    assert routes.ranked(4, 10).tolist() == []
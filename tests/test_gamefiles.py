@@ -0,0 +1,74 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests reloading only the game data that has changed.
+"""
+import functools
+import os
+
+import flint as fl
+
+from conftest import setInstallPath
+from wingman import snapshot
+from wingman.gamefiles import gameFiles, reparse, workerPool, parseInWorker, serveParsed
+from wingman.stages import Stage, StageGraph
+
+
+def test_only_changed_kinds_are_reparsed(install):
+    """A change to the markets file reparses and replaces markets alone."""
+    setInstallPath(install)
+    snapshot.current.install()
+    gameFiles.record()
+    equipment = fl.routines.get_equipment()
+    base = fl.bases['li01_01_base']
+    assert list(fl.routines.get_markets()[base][True].values()) == [150]
+
+    markets = os.path.join(install, 'DATA/EQUIPMENT/market_commodities.ini')
+    with open(markets) as f:
+        contents = f.read()
+    with open(markets, 'w') as f:
+        f.write(contents.replace('1.5', '2.5'))
+    os.utime(markets, ns=(0, 0))
+
+    kinds = gameFiles.changed()
+    assert kinds == {'markets'}
+    data = reparse(kinds)
+    assert set(data['routines']) == {'get_markets'}
+    assert not data['contents'] and not data['resources']
+
+    gameFiles.swap(kinds, data)
+    assert list(fl.routines.get_markets()[fl.bases['li01_01_base']][True].values()) == [250]
+    assert fl.routines.get_equipment() is equipment
+
+
+def test_stages_parsed_in_workers(install):
+    """Stages parsed in worker processes are served into flint's caches, so that the stages themselves only look
+    their results up."""
+    setInstallPath(install)
+    snapshot.current.install()
+    stages = StageGraph([
+        Stage('universe', lambda: (fl.routines.get_systems(), fl.routines.get_bases()),
+              parse=functools.partial(parseInWorker, ('get_systems', 'get_bases'), contents=True)),
+        Stage('goods', lambda: fl.routines.get_goods(), parse=functools.partial(parseInWorker, ('get_goods',))),
+        Stage('markets', lambda: fl.routines.get_markets(), after=('universe', 'goods')),
+    ])
+    with workerPool(2) as executor:
+        stages.run(executor=executor, receive=serveParsed)
+    assert not snapshot.current.routines  # every result served has been taken by its routine
+    assert sorted(b.nickname for b in fl.systems['li01'].bases()) == ['li01_01', 'li01_02']
+    assert list(fl.routines.get_markets()[fl.bases['li01_01_base']][True].values()) == [150]
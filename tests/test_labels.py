@@ -0,0 +1,42 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests the labels used to display bases.
+"""
+import flint as fl
+
+from conftest import setInstallPath
+from wingman.models.labels import baseLabel, getBaseLabels, getBaseSolars
+from wingman.trade import getMarketIndex
+
+
+def test_labels_cover_market_index(install):
+    """Every base in the market index has a label, looked up by its BaseSolar."""
+    setInstallPath(install)
+    index = getMarketIndex()
+    assert set(getBaseLabels()) == {b.nickname for b in index.bases}
+    for base in index.bases:
+        assert baseLabel(base) is getBaseLabels()[base.nickname]
+
+
+def test_label_of_base(install):
+    """A Base is labelled as its solar is."""
+    setInstallPath(install)
+    for base in fl.bases:
+        assert getBaseSolars()[base.nickname] == base.solar()
+        assert baseLabel(base) is getBaseLabels()[base.solar().nickname]
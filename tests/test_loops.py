@@ -0,0 +1,53 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests searching for loops and merging the results.
+"""
+import flint as fl
+import numpy as np
+
+from conftest import setInstallPath
+from wingman.trade import getMarketIndex
+from wingman.trade.loops import Loop, getLoopFinder, mergeLoops
+
+
+def test_rotations_are_merged():
+    """A loop found from each of its bases is only reported once; the same bases in another order are not the same
+    loop."""
+    seen = set()
+    first = mergeLoops([Loop(5, [3, 1, 2], [0, 1, 2]), Loop(4, [1, 3, 2], [2, 1, 0])], seen)
+    assert [loop.bases for loop in first] == [[3, 1, 2], [1, 3, 2]]
+
+    second = mergeLoops([Loop(5, [1, 2, 3], [1, 2, 0]), Loop(4, [2, 1, 3], [1, 0, 2]), Loop(3, [1, 4], [0, 0])], seen)
+    assert [loop.bases for loop in second] == [[1, 4]]
+
+
+def test_clearing_stops_workers(install):
+    """Searches run in spawned worker processes, which are stopped when the finder is discarded along with flint's
+    caches."""
+    setInstallPath(install)
+    index = getMarketIndex()
+    finder = getLoopFinder()
+    futures = finder.search(index.allBases, 2, 1, np.ones(len(index.bases), dtype=bool))
+    assert futures and all(f.result(30) == [] for f in futures)  # one base only sells, so there are no loops
+    assert finder.executor._mp_context.get_start_method() == 'spawn'
+
+    executor = finder.executor
+    fl.invalidate_cache()
+    assert finder.executor is None and executor._shutdown_thread
+    assert getLoopFinder() is not finder
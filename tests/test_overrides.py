@@ -0,0 +1,59 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests correcting the prices in the market index.
+"""
+import flint as fl
+
+from conftest import setInstallPath
+from wingman.trade import correctPrice, getMarketIndex, getPriceOverrides, routesBetween
+from wingman.trade.overrides import PriceOverrides
+from wingman import OVERRIDES_FILE
+
+
+def test_correction_changes_one_side(install):
+    """Correcting the price a good can be bought for leaves the price it can be sold for alone, and is saved."""
+    setInstallPath(install)
+    index = getMarketIndex()
+    base, good = index.bases[0], index.goods[0]
+    b, g = index.baseIndex[base], index.goodIndex[good]
+    sell, buy = int(index.sells[g, b]), int(index.buys[g, b])
+
+    correctPrice(base, good, sell + 7, buy=True)
+    assert (int(index.sells[g, b]), int(index.buys[g, b])) == (sell + 7, buy)
+    assert PriceOverrides(OVERRIDES_FILE).delta(base, good, buy=True) == 7
+    assert PriceOverrides(OVERRIDES_FILE).delta(base, good, buy=False) == 0
+
+    fl.invalidate_cache()  # the correction is applied to a rebuilt index
+    index = getMarketIndex()
+    assert (int(index.sells[g, b]), int(index.buys[g, b])) == (sell + 7, buy)
+    assert getPriceOverrides().delta(base, good, buy=True) == 7
+
+
+def test_cached_routes_follow_corrections(install):
+    """Cached query results reflect a correction made after they were cached."""
+    setInstallPath(install)
+    index = getMarketIndex()
+    base, good = index.bases[0], index.goods[0]
+    g, b = index.goodIndex[good], index.baseIndex[base]
+    system = base.system()
+
+    before = routesBetween(system)
+    correctPrice(base, good, int(index.sells[g, b]) - 5, buy=True)
+    after = routesBetween(system)
+    assert list(after.profit) == [p + 5 for p in before.profit]
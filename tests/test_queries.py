@@ -0,0 +1,47 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+
+This file tests the cache of route query results.
+"""
+import flint as fl
+
+from conftest import setInstallPath
+from wingman.trade import getMarketIndex, queries
+
+
+def test_result_racing_a_clear_is_not_cached(install, monkeypatch):
+    """A result calculated against the market index in use before the cache was cleared is calculated again against
+    the current index, rather than being cached and served afterwards."""
+    setInstallPath(install)
+    indices, findRoutes = [], queries.findRoutes
+
+    def racing(index, *args):
+        indices.append(index)
+        if len(indices) == 1:
+            fl.invalidate_cache()  # as reloading the game files does, while the query is running
+        return findRoutes(index, *args)
+
+    monkeypatch.setattr(queries, 'findRoutes', racing)
+    system = fl.systems['li01']
+    routes = queries.routeCache.get((system, None, None))
+
+    assert len(indices) == 2 and indices[1] is not indices[0]
+    assert indices[1] is getMarketIndex()
+    assert queries.routeCache.get((system, None, None)) is routes
+    assert len(indices) == 2
@@ -0,0 +1,55 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+
+This file tests sharing a single load between concurrent callers.
+"""
+import flint as fl
+from flint import cached
+
+from wingman.singleflight import SingleFlight
+
+
+def counted():
+    """A SingleFlight-wrapped cached function, and a list recording each time the function body runs."""
+    calls = []
+
+    @cached
+    def load(key=None):
+        calls.append(key)
+        return len(calls)
+
+    return SingleFlight(load), calls
+
+
+def test_cache_hits_skip_the_lock():
+    """Once a result is cached, calls return it without registering a load, so cannot wait on another thread."""
+    load, calls = counted()
+    assert load() == 1
+    with load.lock:  # held, as if another thread were registering a load
+        assert load() == 1
+    assert calls == [None] and not load.inFlight
+
+
+def test_cleared_results_are_loaded_again():
+    """Results discarded by flint's cache invalidation, rather than through the wrapper, are loaded again."""
+    load, calls = counted()
+    load('a')
+    fl.invalidate_cache()
+    assert load('a') == 2
+    assert calls == ['a', 'a'] and load.loaded == {('a',)}
@@ -0,0 +1,80 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests saving and restoring snapshots of game data.
+"""
+import glob
+import os
+
+import flint as fl
+
+from conftest import setInstallPath
+from wingman import snapshot
+
+
+def restart(install: str, monkeypatch):
+    """Simulate the start of the application, up to the point main() restores the snapshot."""
+    monkeypatch.setattr(fl.paths, 'install', None)
+    setInstallPath(install)
+    return snapshot.restore()
+
+
+def test_snapshot_survives_restart(install, monkeypatch):
+    """A snapshot saved in one run is restored in the next, even though setting the install path invalidates
+    flint's cache."""
+    assert not restart(install, monkeypatch)
+    path = snapshot.save()
+    assert os.path.exists(path)
+
+    assert restart(install, monkeypatch)
+    assert os.path.exists(path)
+    assert snapshot.current.restored
+    assert sorted(b.nickname for b in fl.systems['li01'].bases()) == ['li01_01', 'li01_02']
+
+
+def test_changed_files_miss(install, monkeypatch):
+    """A snapshot made from other game files is not restored, and is replaced by the next one saved."""
+    restart(install, monkeypatch)
+    stale = snapshot.save()
+
+    goods = os.path.join(install, 'DATA/EQUIPMENT/goods.ini')
+    with open(goods, 'a') as f:
+        f.write('\n')
+    os.utime(goods, ns=(0, 0))
+
+    assert not restart(install, monkeypatch)
+    fresh = snapshot.save()
+    assert fresh != stale
+    assert glob.glob(os.path.join('cache', 'snapshot-*')) == [fresh]
+
+
+def test_same_size_edit_misses(install, monkeypatch):
+    """An INI edited without changing its size or modification time, as patchers often do, is still noticed."""
+    restart(install, monkeypatch)
+    snapshot.save()
+
+    markets = os.path.join(install, 'DATA/EQUIPMENT/market_commodities.ini')
+    stat = os.stat(markets)
+    with open(markets) as f:
+        contents = f.read()
+    with open(markets, 'w') as f:
+        f.write(contents.replace('1.5', '2.5'))
+    os.utime(markets, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert os.stat(markets).st_size == stat.st_size
+
+    assert not restart(install, monkeypatch)
@@ -0,0 +1,107 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+This file tests the scheduler for the stages of loading.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from wingman.stages import Stage, StageGraph
+
+
+def graph(calls: list, failing: str = None) -> StageGraph:
+    """A graph in the shape of the one used at start, whose stages append their names to `calls`."""
+    def stage(name: str, after=()):
+        def function():
+            if name == failing:
+                raise RuntimeError(name)
+            calls.append(name)
+        return Stage(name, function, after)
+
+    return StageGraph([
+        stage('markets', ('universe', 'equipment', 'goods')),
+        stage('universe', ('systems',)),
+        stage('systems'),
+        stage('equipment'),
+        stage('goods'),
+    ])
+
+
+def test_dependencies_run_first():
+    """Each stage runs after the stages it depends on, and is announced once it has run."""
+    calls, finished = [], []
+    stages = graph(calls)
+    stages.run(finished.append)
+    assert finished == calls
+    assert sorted(calls) == sorted(stages.stages)
+    for name, stage in stages.stages.items():
+        assert all(calls.index(d) < calls.index(name) for d in stage.after)
+    assert set(stages.timings) == set(stages.stages)
+
+
+def test_error_propagates():
+    """An exception raised by a stage is raised by run, and the stages depending on it are not run."""
+    calls, finished = [], []
+    with pytest.raises(RuntimeError, match='universe'):
+        graph(calls, failing='universe').run(finished.append)
+    assert 'universe' not in finished
+    assert 'markets' not in calls
+
+
+def test_invalid_graphs():
+    """Cycles and unknown dependencies are rejected when the graph is made."""
+    with pytest.raises(ValueError, match='cycle'):
+        StageGraph([Stage('a', lambda: None, ('b',)), Stage('b', lambda: None, ('a',))])
+    with pytest.raises(ValueError, match='no stage'):
+        StageGraph([Stage('a', lambda: None, ('b',))])
+
+
+def test_parses_are_received_in_order():
+    """Parses run at once, but each is received just before its stage runs, after the stages it depends on, even if
+    it finishes first."""
+    calls, release = [], threading.Event()
+
+    def parse(name: str):
+        if name == 'systems':
+            release.wait(5)  # held until the parse the universe stage depends on has finished
+        elif name == 'universe':
+            release.set()
+        return name
+
+    stages = StageGraph([
+        Stage(name, lambda name=name: calls.append(name), after, parse=lambda name=name: parse(name))
+        for name, after in [('systems', ()), ('universe', ('systems',)), ('markets', ('universe',))]
+    ])
+    with ThreadPoolExecutor(3) as executor:
+        stages.run(executor=executor, receive=lambda result: calls.append(f'received {result}'))
+    assert calls == ['received systems', 'systems', 'received universe', 'universe', 'received markets', 'markets']
+
+
+def test_parse_error_propagates():
+    """An exception raised by a parse is raised by run, and the stage whose parse failed is not run."""
+    calls = []
+
+    def fail():
+        raise RuntimeError('parse')
+
+    stages = StageGraph([Stage('a', lambda: calls.append('a'), parse=fail), Stage('b', lambda: calls.append('b'))])
+    with ThreadPoolExecutor(1) as executor, pytest.raises(RuntimeError, match='parse'):
+        stages.run(executor=executor)
+    assert 'a' not in calls
@@ -0,0 +1,86 @@
+"""
+Copyright © 2016-2017, 2020 biqqles.
+
+This file is part of Wingman.
+
+Wingman is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Wingman is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with Wingman.  If not, see <http://www.gnu.org/licenses/>.
+
+
+This file tests the estimation of travel times between bases.
+"""
+from collections import namedtuple
+from types import SimpleNamespace
+
+import flint as fl
+import numpy as np
+
+from conftest import setInstallPath
+from wingman.trade import getMarketIndex, getJumpTable
+from wingman.trade.jumps import JumpTable
+from wingman.trade.travel import TravelTimes
+
+Jump = namedtuple('Jump', 'pos')
+
+
+class System:
+    """A system with gates at the given positions, keyed by the system each leads to."""
+    def __init__(self, nickname: str):
+        self.nickname = nickname
+        self.gates = {}
+
+    def connections(self):
+        return {Jump(pos): destination for destination, pos in self.gates.items()}
+
+
+def line() -> TravelTimes:
+    """Travel times in the systems a - b - c, with a base in a and one in c, and d, which the jump table says is
+    reachable from a but which has no gate leading there."""
+    a, b, c, d = (System(n) for n in 'abcd')
+    a.gates = {b: (10, 0, 0)}
+    b.gates = {a: (0, 0, 0), c: (0, 0, 100)}
+    c.gates = {b: (0, 0, 0)}
+    d.gates = {a: (0, 0, 0)}
+    jumps = JumpTable.fromGraph({a: {b: 1, d: 1}, b: {a: 1, c: 1}, c: {b: 1}, d: {a: 1}})
+    index = SimpleNamespace(systems=[a, c, d], systemOf=np.array([0, 1, 2]),
+                            bases=[SimpleNamespace(pos=(0, 0, 0)), SimpleNamespace(pos=(0, 0, 50)),
+                                   SimpleNamespace(pos=(0, 0, 0))])
+    return TravelTimes(index, jumps)
+
+
+def test_route_through_systems():
+    """A route's length runs from the origin to its system's exit gate, between the gates of each system passed
+    through, and from the last entry gate to the destination."""
+    times = line()
+    estimate = times.estimate(np.array([0, 1, 0]), np.array([1, 0, 0]), cruiseSpeed=10)
+    expected = (10 + 100 + 50) / 10 + 2 * TravelTimes.JUMP_TIME + TravelTimes.DOCK_TIME
+    assert estimate.tolist() == [expected, expected, TravelTimes.DOCK_TIME]
+
+
+def test_missing_gate_is_unreachable():
+    """A route needing a gate that doesn't exist is estimated to take forever, rather than using another gate."""
+    times = line()
+    assert np.isnan(times.gate(np.array([0]), np.array([3]))).all()  # a has no gate to d
+    assert np.isinf(times.estimate(np.array([0]), np.array([2]))).all()
+
+
+def test_universe_without_jumps(install):
+    """Travel times can be estimated in a universe with no jumps at all."""
+    setInstallPath(install)
+    index = getMarketIndex()
+    times = TravelTimes(index, getJumpTable())
+    assert len(times.gateKeys) == 0
+    estimate = times.estimate(np.array([0, 1]), np.array([1, 1]))
+    distance = np.linalg.norm(np.subtract(fl.bases['li01_02_base'].solar().pos, fl.bases['li01_01_base'].solar().pos))
+    assert estimate[1] == TravelTimes.DOCK_TIME
+    assert np.isclose(estimate[0], distance / fl.maps.DEFAULT_CRUISE_SPEED + TravelTimes.DOCK_TIME)